@@ -1,27 +1,158 @@
 """
-Async Perplexity AI client (placeholder)
+Async Perplexity AI client
 """
 
 from __future__ import annotations
 
-from typing import Optional
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
 
 from perplexity_ai.auth import PerplexityAuth
+from perplexity_ai.endpoints.ask import AsyncAskEndpoint, FileContent
+from perplexity_ai.models.request import Mode, Model, Source
+from perplexity_ai.models.response import AskResponse
+from perplexity_ai.session import AsyncPerplexitySession
+from perplexity_ai.stealth import HeaderGenerator
 
 
 class AsyncClient:
     """Perplexity AI asynchronous client
 
-    TODO: Implement async variant with httpx or async curl-cffi
+    Same features as Client, on top of curl_cffi AsyncSession. Many
+    queries can be in flight at once from a single event loop, which
+    is much cheaper than a thread pool of sync clients.
+
+    Example:
+        >>> async with AsyncClient() as client:
+        ...     response = await client.ask("What is quantum computing?")
+        ...     print(response.text)
     """
 
     def __init__(
         self,
-        auth: Optional[PerplexityAuth] = None,
+        auth: PerplexityAuth | None = None,
         language: str = "ru-RU",
         timezone: str = "Europe/Moscow",
-        device_id: Optional[str] = None,
+        device_id: str | None = None,
     ):
-        raise NotImplementedError(
-            "Async client not yet implemented. Use Client instead."
+        """Initialize Perplexity AI async client
+
+        Args:
+            auth: Authentication credentials (optional)
+            language: Accept-Language header value
+            timezone: User timezone
+            device_id: Device ID (will generate if None)
+        """
+        self.auth = auth or PerplexityAuth()
+        self.language = language
+        self.timezone = timezone
+        self.header_gen = HeaderGenerator(device_id=device_id, language=language)
+
+        # Initialize session
+        cookies = self.auth.to_cookies()
+        self.session = AsyncPerplexitySession(cookies=cookies)
+
+        # Initialize endpoints
+        self._ask_endpoint = AsyncAskEndpoint(
+            session=self.session,
+            header_gen=self.header_gen,
+            auth=self.auth,
+            language=language,
+            timezone=timezone,
+        )
+
+    async def warmup(self) -> bool:
+        """Connect to perplexity.ai ahead of the first ask()
+
+        Returns:
+            True if the server answered
+        """
+        return await self.session.warmup()
+
+    async def ask(
+        self,
+        query: str,
+        *,
+        mode: Mode | str = Mode.CONCISE,
+        model: Model | str | None = None,
+        sources: list[Source | str] | None = None,
+        follow_up: AskResponse | None = None,
+        files: dict[str, FileContent] | None = None,
+        stream: bool = False,
+        incognito: bool = False,
+    ) -> AskResponse | AsyncIterator[AskResponse]:
+        """Ask a question to Perplexity AI
+
+        Args:
+            query: Question or search query
+            mode: Response mode (concise, copilot, research)
+            model: AI model to use (requires Pro account)
+            sources: Search sources (web, scholar, social)
+            follow_up: Previous response for follow-up questions
+            files: Files to upload (name -> bytes, Path or binary file object)
+            stream: Enable streaming responses
+            incognito: Use incognito mode
+
+        Returns:
+            AskResponse or AsyncIterator[AskResponse] if streaming
+
+        Example:
+            >>> # Simple query
+            >>> response = await client.ask("Explain quantum computing")
+            >>>
+            >>> # Streaming
+            >>> async for chunk in await client.ask("Long explanation", stream=True):
+            ...     print(chunk.text, end="", flush=True)
+        """
+        return await self._ask_endpoint.ask(
+            query=query,
+            mode=mode,
+            model=model,
+            sources=sources,
+            follow_up=follow_up,
+            files=files,
+            stream=stream,
+            incognito=incognito,
         )
+
+    async def ask_many(
+        self,
+        queries: list[str],
+        *,
+        concurrency: int = 8,
+        **kwargs: Any,
+    ) -> list[AskResponse]:
+        """Ask several questions concurrently
+
+        Args:
+            queries: Questions or search queries
+            concurrency: Maximum number of requests in flight
+            **kwargs: Options passed to ask() for every query (stream is not allowed)
+
+        Returns:
+            List of AskResponse in the same order as queries
+
+        Example:
+            >>> responses = await client.ask_many(["What is AI?", "What is ML?"])
+        """
+        if kwargs.get("stream"):
+            raise ValueError("ask_many() does not support stream=True")
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def ask_one(query: str) -> AskResponse:
+            async with semaphore:
+                return await self.ask(query, **kwargs)
+
+        return await asyncio.gather(*(ask_one(query) for query in queries))
+
+    async def close(self) -> None:
+        """Close HTTP session"""
+        await self.session.close()
+
+    async def __aenter__(self) -> AsyncClient:
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
@@ -4,7 +4,6 @@ Authentication management for Perplexity AI
 
 from __future__ import annotations
 
-from typing import Dict, Optional
 from pydantic import BaseModel, Field
 
 
@@ -20,23 +19,23 @@ class PerplexityAuth(BaseModel):
         device_id: Device identifier (iOS format)
     """
 
-    bearer_token: Optional[str] = Field(default=None, description="JWT Bearer token")
-    session_token: Optional[str] = Field(
+    bearer_token: str | None = Field(default=None, description="JWT Bearer token")
+    session_token: str | None = Field(
         default=None, description="NextAuth session token"
     )
-    csrf_token: Optional[str] = Field(default=None, description="CSRF token")
-    cf_clearance: Optional[str] = Field(
+    csrf_token: str | None = Field(default=None, description="CSRF token")
+    cf_clearance: str | None = Field(
         default=None, description="Cloudflare clearance"
     )
-    user_nextauth_id: Optional[str] = Field(
+    user_nextauth_id: str | None = Field(
         default=None, description="User NextAuth ID"
     )
-    device_id: Optional[str] = Field(
+    device_id: str | None = Field(
         default=None, description="Device ID (iOS format)"
     )
 
     @classmethod
-    def from_cookies(cls, cookies: Dict[str, str]) -> PerplexityAuth:
+    def from_cookies(cls, cookies: dict[str, str]) -> PerplexityAuth:
         """Create auth from cookie dictionary
 
         Args:
@@ -51,7 +50,7 @@ class PerplexityAuth(BaseModel):
             cf_clearance=cookies.get("cf_clearance"),
         )
 
-    def to_cookies(self) -> Dict[str, str]:
+    def to_cookies(self) -> dict[str, str]:
         """Convert to cookie dictionary
 
         Returns:
@@ -66,7 +65,7 @@ class PerplexityAuth(BaseModel):
             cookies["cf_clearance"] = self.cf_clearance
         return cookies
 
-    def to_headers(self) -> Dict[str, str]:
+    def to_headers(self) -> dict[str, str]:
         """Convert to request headers
 
         Returns:
@@ -4,11 +4,22 @@ Main Perplexity AI client (synchronous)
 
 from __future__ import annotations
 
-from typing import Dict, Iterator, List, Optional
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
 
 from perplexity_ai.auth import PerplexityAuth
-from perplexity_ai.endpoints.ask import AskEndpoint
-from perplexity_ai.models.request import Mode, Model, Source
+from perplexity_ai.endpoints.ask import AskEndpoint, FileContent
+from perplexity_ai.models.request import (
+    _MODE_LOOKUP,
+    _MODEL_LOOKUP,
+    _SOURCE_LOOKUP,
+    Mode,
+    Model,
+    Source,
+)
 from perplexity_ai.models.response import AskResponse
 from perplexity_ai.session import PerplexitySession
 from perplexity_ai.stealth import HeaderGenerator
@@ -32,10 +43,12 @@ class Client:
 
     def __init__(
         self,
-        auth: Optional[PerplexityAuth] = None,
+        auth: PerplexityAuth | None = None,
         language: str = "ru-RU",
         timezone: str = "Europe/Moscow",
-        device_id: Optional[str] = None,
+        device_id: str | None = None,
+        warmup: bool = False,
+        cache_size: int = 0,
     ):
         """Initialize Perplexity AI client
 
@@ -44,15 +57,26 @@ class Client:
             language: Accept-Language header value
             timezone: User timezone
             device_id: Device ID (will generate if None)
+            warmup: Connect to perplexity.ai now, so the first non-streaming
+                ask() does not pay for the TLS handshake
+            cache_size: Keep up to this many answers and return them for
+                identical repeated asks (0 disables the cache)
         """
         self.auth = auth or PerplexityAuth()
         self.language = language
         self.timezone = timezone
         self.header_gen = HeaderGenerator(device_id=device_id, language=language)
 
+        # Exact-match LRU of finished answers
+        self.cache_size = cache_size
+        self._cache: OrderedDict[Hashable, AskResponse] = OrderedDict()
+        self._cache_lock = threading.Lock()
+
         # Initialize session
         cookies = self.auth.to_cookies()
         self.session = PerplexitySession(cookies=cookies)
+        if warmup:
+            self.session.warmup()
 
         # Initialize endpoints
         self._ask_endpoint = AskEndpoint(
@@ -68,10 +92,10 @@ class Client:
         query: str,
         *,
         mode: Mode | str = Mode.CONCISE,
-        model: Optional[Model | str] = None,
-        sources: Optional[List[Source | str]] = None,
-        follow_up: Optional[AskResponse] = None,
-        files: Optional[Dict[str, bytes]] = None,
+        model: Model | str | None = None,
+        sources: list[Source | str] | None = None,
+        follow_up: AskResponse | None = None,
+        files: dict[str, FileContent] | None = None,
         stream: bool = False,
         incognito: bool = False,
     ) -> AskResponse | Iterator[AskResponse]:
@@ -83,13 +107,17 @@ class Client:
             model: AI model to use (requires Pro account)
             sources: Search sources (web, scholar, social)
             follow_up: Previous response for follow-up questions
-            files: Files to upload (name -> bytes)
+            files: Files to upload (name -> bytes, Path or binary file object)
             stream: Enable streaming responses
             incognito: Use incognito mode
 
         Returns:
             AskResponse or Iterator[AskResponse] if streaming
 
+        With cache_size set, a non-streaming ask without files that matches
+        an earlier one exactly is answered from the cache. Every call gets
+        its own copy of the cached answer, so changing it is safe.
+
         Example:
             >>> # Simple query
             >>> response = client.ask("Explain quantum computing")
@@ -105,7 +133,16 @@ class Client:
             ...     model="claude37sonnetthinking"
             ... )
         """
-        return self._ask_endpoint.ask(
+        key = None
+        if self.cache_size > 0 and not stream and not files:
+            key = self._cache_key(query, mode, model, sources, follow_up, incognito)
+            with self._cache_lock:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    return cached.model_copy(deep=True)
+
+        response = self._ask_endpoint.ask(
             query=query,
             mode=mode,
             model=model,
@@ -116,6 +153,80 @@ class Client:
             incognito=incognito,
         )
 
+        if key is not None:
+            with self._cache_lock:
+                self._cache[key] = response.model_copy(deep=True)
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return response
+
+    @staticmethod
+    def _cache_key(
+        query: str,
+        mode: Mode | str,
+        model: Model | str | None,
+        sources: list[Source | str] | None,
+        follow_up: AskResponse | None,
+        incognito: bool,
+    ) -> Hashable:
+        """Build cache key from the values AskEndpoint sends
+
+        Resolved through the same lookups as the request body, so enum
+        members and their values, and omitted defaults and their explicit
+        values (web sources, pplx_pro model), map to the same key.
+        """
+        mode_value = (_MODE_LOOKUP.get(mode) or Mode(mode)).value
+        if model:
+            model_value = (_MODEL_LOOKUP.get(model) or Model(model)).value
+        else:
+            model_value = Model.PPLX_PRO.value
+        if sources:
+            sources_key = tuple((_SOURCE_LOOKUP.get(s) or Source(s)).value for s in sources)
+        else:
+            sources_key = (Source.WEB.value,)
+        return (
+            query,
+            mode_value,
+            model_value,
+            sources_key,
+            follow_up.backend_uuid if follow_up else None,
+            bool(incognito),
+        )
+
+    def clear_cache(self) -> None:
+        """Drop all cached answers"""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def ask_many(
+        self,
+        queries: list[str],
+        *,
+        max_workers: int = 8,
+        **kwargs: Any,
+    ) -> list[AskResponse]:
+        """Ask several questions concurrently from a thread pool
+
+        All workers go through this client's session; curl_cffi gives each
+        thread its own curl handle, so requests do not block each other.
+
+        Args:
+            queries: Questions or search queries
+            max_workers: Maximum number of requests in flight
+            **kwargs: Options passed to ask() for every query (stream is not allowed)
+
+        Returns:
+            List of AskResponse in the same order as queries
+
+        Example:
+            >>> responses = client.ask_many(["What is AI?", "What is ML?"])
+        """
+        if kwargs.get("stream"):
+            raise ValueError("ask_many() does not support stream=True")
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda query: self.ask(query, **kwargs), queries))
+
     def close(self) -> None:
         """Close HTTP session"""
         self.session.close()
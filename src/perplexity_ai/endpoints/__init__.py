@@ -2,6 +2,6 @@
 API endpoint implementations
 """
 
-from perplexity_ai.endpoints.ask import AskEndpoint
+from perplexity_ai.endpoints.ask import AskEndpoint, AsyncAskEndpoint
 
-__all__ = ["AskEndpoint"]
+__all__ = ["AskEndpoint", "AsyncAskEndpoint"]
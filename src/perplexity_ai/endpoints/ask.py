@@ -4,20 +4,62 @@ Implementation of /rest/sse/perplexity_ask endpoint
 
 from __future__ import annotations
 
-from typing import Dict, Iterator, List, Optional
+import mimetypes
+import os
+import re
+from collections.abc import AsyncIterator, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO
+from uuid import uuid4
 
 from perplexity_ai.auth import PerplexityAuth
-from perplexity_ai.models.request import AskParams, AskRequest, Mode, Model, Source
+from perplexity_ai.models.request import (
+    _MODE_LOOKUP,
+    _MODEL_LOOKUP,
+    _SOURCE_LOOKUP,
+    AskParams,
+    AskRequest,
+    Mode,
+    Model,
+    Source,
+)
 from perplexity_ai.models.response import AskResponse, SSEMessage
-from perplexity_ai.session import PerplexitySession
+from perplexity_ai.parsers import SSEParser
+from perplexity_ai.session import PerplexitySession, libcurl_has_zstd
 from perplexity_ai.stealth import HeaderGenerator
-from perplexity_ai.utils import SSEParser
+from perplexity_ai.utils._json import dumps as _dumps
+from perplexity_ai.utils._json import loads as _loads
+
+if TYPE_CHECKING:
+    from curl_cffi import CurlMime
+
+
+# File to attach: raw bytes, a path on disk, or a binary file object
+FileContent = bytes | Path | BinaryIO
+
+# Cloudinary image URLs carry a signature segment that must be dropped
+_SIGNED_UPLOAD_RE = re.compile(r"/private/s--.*?--/v\d+/user_uploads/")
 
 
 class AskEndpoint:
     """Handler for /rest/sse/perplexity_ask endpoint"""
 
     ENDPOINT = "/rest/sse/perplexity_ask"
+    UPLOAD_ENDPOINT = "/rest/uploads/create_upload_url"
+    UPLOAD_TIMEOUT = 300
+
+    # Params that change between requests; everything else in AskParams is
+    # serialized once per endpoint
+    DYNAMIC_PARAMS = frozenset({
+        "frontend_uuid",
+        "frontend_context_uuid",
+        "sources",
+        "is_incognito",
+        "attachments",
+        "model_preference",
+        "last_backend_uuid",
+        "user_nextauth_id",
+    })
 
     def __init__(
         self,
@@ -26,155 +68,509 @@ class AskEndpoint:
         auth: PerplexityAuth,
         language: str,
         timezone: str,
+        validate: bool = False,
     ):
         self.session = session
         self.header_gen = header_gen
         self.auth = auth
         self.language = language
         self.timezone = timezone
+        self.validate = validate
+
+        # Static params are encoded to JSON once, leaving the object open so
+        # _build_request only has to encode and append the per-call fields.
+        # The uuid placeholders keep the factories from running for nothing.
+        static_params = {
+            key: value
+            for key, value in AskParams(
+                language=language,
+                timezone=timezone,
+                frontend_uuid="",
+                frontend_context_uuid="",
+            ).model_dump(mode="json", exclude_none=True).items()
+            if key not in self.DYNAMIC_PARAMS
+        }
+        self._params_prefix = _dumps(static_params)[:-1] + b","
+
+        # Device headers never change for a client; only the Sentry trace
+        # ids are fresh per request, and only built when enabled (see _headers)
+        self._sse_headers = header_gen.request_headers(sse=True, with_sentry=False)
+        self._api_headers = header_gen.request_headers(with_sentry=False)
+        # Buffered asks also take zstd, which decompresses faster than
+        # brotli, when libcurl can decode it; streamed asks switch to
+        # identity in _prepare()
+        if libcurl_has_zstd():
+            self._sse_headers["Accept-Encoding"] = "gzip, deflate, br, zstd"
+
+    def _headers(self, base: dict[str, str]) -> dict[str, str]:
+        """Copy cached headers and stamp per-request Sentry and auth values"""
+        headers = base.copy()
+        if self.header_gen.sentry:
+            headers.update(self.header_gen.sentry_headers())
+        headers.update(self.auth.to_headers())
+        return headers
 
     def _build_request(
         self,
         query: str,
         mode: Mode | str,
-        model: Optional[Model | str],
-        sources: Optional[List[Source | str]],
-        follow_up: Optional[AskResponse],
+        model: Model | str | None,
+        sources: list[Source | str] | None,
+        follow_up: AskResponse | None,
         incognito: bool,
-    ) -> AskRequest:
-        """Build AskRequest from parameters"""
-        # Convert string enums
-        if isinstance(mode, str):
-            mode = Mode(mode)
-        if model and isinstance(model, str):
-            model = Model(model)
-
-        sources_list = [Source.WEB]
+        attachments: list[str] | None = None,
+    ) -> bytes:
+        """Build perplexity_ask JSON body from parameters
+
+        Returns the encoded body, spliced from the prebuilt static params
+        and the per-call fields. Skips constructing AskRequest on the hot
+        path; pass validate=True to the endpoint to check every body
+        against the model.
+        """
+        # Convert string enums; the constructors only run to raise on
+        # unknown values
+        mode = _MODE_LOOKUP.get(mode) or Mode(mode)
+        if model:
+            model = _MODEL_LOOKUP.get(model) or Model(model)
+
+        sources_list = [Source.WEB.value]
         if sources:
-            sources_list = [
-                Source(s) if isinstance(s, str) else s for s in sources
-            ]
+            sources_list = [(_SOURCE_LOOKUP.get(s) or Source(s)).value for s in sources]
 
         # Build params
-        params = AskParams(
-            language=self.language,
-            timezone=self.timezone,
-            sources=sources_list,
-            is_incognito=incognito,
-        )
+        params: dict[str, Any] = {
+            "frontend_uuid": str(uuid4()),
+            "frontend_context_uuid": str(uuid4()),
+            "sources": sources_list,
+            "is_incognito": incognito,
+            "attachments": attachments or [],
+        }
 
-        # Set model preference
-        if model:
-            params.model_preference = model
-        elif mode == Mode.RESEARCH:
-            params.model_preference = Model.PPLX_PRO
+        # Set model preference; AskParams defaults it to pplx_pro, which is
+        # also what research mode asks for
+        params["model_preference"] = model.value if model else Model.PPLX_PRO.value
 
         # Add follow-up context
-        if follow_up:
-            params.last_backend_uuid = follow_up.backend_uuid
+        if follow_up and follow_up.backend_uuid:
+            params["last_backend_uuid"] = follow_up.backend_uuid
 
         # Add user auth
         if self.auth.user_nextauth_id:
-            params.user_nextauth_id = self.auth.user_nextauth_id
+            params["user_nextauth_id"] = self.auth.user_nextauth_id
 
-        return AskRequest(query_str=query, params=params)
+        body = b"".join((
+            b'{"query_str":',
+            _dumps(query),
+            b',"params":',
+            self._params_prefix,
+            _dumps(params)[1:],
+            b"}",
+        ))
+        if self.validate:
+            AskRequest.model_validate(_loads(body))
 
-    def _parse_sse_response(self, response_text: str) -> AskResponse:
-        """Parse SSE response into AskResponse"""
-        text_parts = []
-        last_message: Optional[SSEMessage] = None
+        return body
+
+    def _prepare(
+        self,
+        query: str,
+        mode: Mode | str,
+        model: Model | str | None,
+        sources: list[Source | str] | None,
+        follow_up: AskResponse | None,
+        stream: bool,
+        incognito: bool,
+        attachments: list[str] | None = None,
+    ) -> tuple[dict[str, str], bytes]:
+        """Build request headers and encoded JSON body"""
+        body = self._build_request(
+            query=query,
+            mode=mode,
+            model=model,
+            sources=sources,
+            follow_up=follow_up,
+            incognito=incognito,
+            attachments=attachments,
+        )
+
+        headers = self._headers(self._sse_headers)
 
-        for event_data in SSEParser.parse_stream(response_text):
+        if stream:
+            # Compression makes intermediaries buffer the body before the
+            # first byte reaches us, which defeats streaming
+            headers["Accept-Encoding"] = "identity"
+            headers["Cache-Control"] = "no-cache"
+
+        return headers, body
+
+    @staticmethod
+    def _file_part(content: FileContent) -> tuple[int, dict[str, Any]]:
+        """Get file size and CurlMime part source for a file
+
+        Files on disk are handed to libcurl by path, so it streams them
+        from the file descriptor instead of us reading them into memory.
+        """
+        if isinstance(content, bytes):
+            return len(content), {"data": content}
+
+        if isinstance(content, Path):
+            return content.stat().st_size, {"local_path": content}
+
+        path = getattr(content, "name", None)
+        if isinstance(path, str) and os.path.isfile(path) and content.tell() == 0:
+            return os.path.getsize(path), {"local_path": path}
+
+        data = content.read()
+        return len(data), {"data": data}
+
+    def _upload_info_request(
+        self, filename: str, content: FileContent
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Build create_upload_url request body and CurlMime part kwargs"""
+        content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        size, source = self._file_part(content)
+
+        body = {
+            "content_type": content_type,
+            "file_size": size,
+            "filename": filename,
+            "force_image": False,
+            "source": "default",
+        }
+        part = {"name": "file", "content_type": content_type, "filename": filename, **source}
+        return body, part
+
+    @staticmethod
+    def _upload_form(info: dict[str, Any], part: dict[str, Any]) -> CurlMime:
+        """Build multipart form for the upload bucket"""
+        # The session has loaded curl_cffi by the time anything is uploaded
+        from curl_cffi import CurlMime
+
+        form = CurlMime()
+        for key, value in info["fields"].items():
+            form.addpart(name=key, data=str(value).encode())
+        form.addpart(**part)
+        return form
+
+    @staticmethod
+    def _uploaded_url(info: dict[str, Any], response) -> str:
+        """Get attachment URL of an uploaded file"""
+        if "image/upload" in info["s3_object_url"]:
+            return _SIGNED_UPLOAD_RE.sub(
+                "/private/user_uploads/", response.json()["secure_url"]
+            )
+        return info["s3_object_url"]
+
+    def _upload_files(self, files: dict[str, FileContent]) -> list[str]:
+        """Upload files and return their attachment URLs"""
+        headers = self._headers(self._api_headers)
+        params = {"version": self.header_gen.API_VERSION, "source": "default"}
+        attachments = []
+
+        for filename, content in files.items():
+            body, part = self._upload_info_request(filename, content)
+            response = self.session.post(
+                self.UPLOAD_ENDPOINT, headers=headers, params=params, json=body, timeout=30
+            )
+            response.raise_for_status()
+            info = response.json()
+
+            form = self._upload_form(info, part)
             try:
-                message = SSEMessage(**event_data)
-                last_message = message
+                upload = self.session.post_multipart(
+                    info["s3_bucket_url"], form, timeout=self.UPLOAD_TIMEOUT
+                )
+                upload.raise_for_status()
+            finally:
+                form.close()
 
-                # Accumulate text
-                if message.text:
-                    text_parts.append(message.text)
+            attachments.append(self._uploaded_url(info, upload))
 
-            except Exception:
+        return attachments
+
+    @staticmethod
+    def _decode_chunk(
+        parser: SSEParser, raw: bytes, final: bool = False
+    ) -> Iterator[dict[str, Any]]:
+        """Decode one body chunk into the SSE event payloads it completes
+
+        The parser buffers raw bytes and only decodes complete lines, so a
+        multi-byte character split across chunks is handled and the body is
+        never held as a single string.
+        """
+        if final:
+            # Flush a trailing event not terminated by a newline
+            raw += b"\n"
+
+        yield from parser.feed_data(raw)
+
+    @staticmethod
+    def _to_message(data: Any) -> SSEMessage | None:
+        """Validate event payload as SSEMessage, None if it is not one
+
+        Malformed frames (non-object payloads, non-string text, missing
+        fields) are skipped rather than failing the whole answer.
+        """
+        try:
+            return SSEMessage.from_dict(data)
+        except TypeError:
+            return None
+
+    @staticmethod
+    def _event_response(data: dict[str, Any], text: str) -> AskResponse:
+        """Build AskResponse straight from a raw event payload
+
+        Used on the streaming path, where validating every event as
+        SSEMessage would cost more than the handful of fields we read.
+        """
+        return AskResponse(
+            text=text,
+            thread_uuid=data.get("uuid"),
+            backend_uuid=data.get("backend_uuid"),
+            context_uuid=data.get("context_uuid"),
+            thread_url_slug=data.get("thread_url_slug"),
+            mode=data.get("mode"),
+            model=data.get("display_model"),
+        )
+
+    @staticmethod
+    def _to_response(message: SSEMessage, text: str) -> AskResponse:
+        """Build AskResponse carrying message metadata"""
+        return AskResponse(
+            text=text,
+            thread_uuid=message.uuid,
+            backend_uuid=message.backend_uuid,
+            context_uuid=message.context_uuid,
+            thread_url_slug=message.thread_url_slug,
+            mode=message.mode,
+            model=message.display_model,
+        )
+
+    def _iter_sse_bytes(self, response) -> Iterator[bytes]:
+        """Iterate raw response body chunks, closing the response when done"""
+        try:
+            yield from response.iter_content()
+        finally:
+            response.close()
+
+    def _iter_sse_events(self, response) -> Iterator[dict[str, Any]]:
+        """Decode SSE event payloads as body chunks arrive"""
+        parser = SSEParser()
+
+        for raw in self._iter_sse_bytes(response):
+            yield from self._decode_chunk(parser, raw)
+        yield from self._decode_chunk(parser, b"", final=True)
+
+    def _iter_body_events(self, body: bytes) -> Iterator[dict[str, Any]]:
+        """Decode SSE event payloads of a complete response body"""
+        yield from self._decode_chunk(SSEParser(keep_events=False), body, final=True)
+
+    def _parse_sse_body(self, body: bytes) -> AskResponse:
+        """Parse complete SSE response body into AskResponse"""
+        text_parts = []
+        accumulated_len = 0
+        last_message: SSEMessage | None = None
+
+        for data in self._iter_body_events(body):
+            message = self._to_message(data)
+            if message is None:
                 continue
+            last_message = message
+
+            # Server sends cumulative text, keep only the new part
+            if len(message.text) > accumulated_len:
+                text_parts.append(message.text[accumulated_len:])
+                accumulated_len = len(message.text)
 
         if not last_message:
             return AskResponse(text="")
 
-        return AskResponse(
-            text="".join(text_parts) or last_message.text,
-            thread_uuid=last_message.uuid,
-            backend_uuid=last_message.backend_uuid,
-            context_uuid=last_message.context_uuid,
-            thread_url_slug=last_message.thread_url_slug,
-            mode=last_message.mode,
-            model=last_message.display_model,
-        )
+        return self._to_response(last_message, "".join(text_parts) or last_message.text)
 
-    def _stream_sse_response(
-        self, response_text: str
-    ) -> Iterator[AskResponse]:
-        """Stream SSE response as iterator"""
-        accumulated_text = ""
+    def _stream_sse_response(self, response) -> Iterator[AskResponse]:
+        """Stream SSE response as iterator
 
-        for event_data in SSEParser.parse_stream(response_text):
-            try:
-                message = SSEMessage(**event_data)
-
-                # Check for new text
-                if message.text and message.text != accumulated_text:
-                    new_text = message.text[len(accumulated_text):]
-                    accumulated_text = message.text
-
-                    yield AskResponse(
-                        text=new_text,
-                        thread_uuid=message.uuid,
-                        backend_uuid=message.backend_uuid,
-                        context_uuid=message.context_uuid,
-                        thread_url_slug=message.thread_url_slug,
-                        mode=message.mode,
-                        model=message.display_model,
-                    )
+        Every event is yielded as soon as it arrives, so the first token is
+        available as soon as the server sends it.
+        """
+        prev_len = 0
 
-            except Exception:
+        for data in self._iter_sse_events(response):
+            # Skip non-object frames (e.g. list elements like "ping")
+            if not isinstance(data, dict):
                 continue
+            # Server sends cumulative text, yield only the delta
+            text = data.get("text")
+            if isinstance(text, str) and len(text) > prev_len:
+                yield self._event_response(data, text[prev_len:])
+                prev_len = len(text)
 
     def ask(
         self,
         query: str,
         mode: Mode | str,
-        model: Optional[Model | str],
-        sources: Optional[List[Source | str]],
-        follow_up: Optional[AskResponse],
-        files: Optional[Dict[str, bytes]],
+        model: Model | str | None,
+        sources: list[Source | str] | None,
+        follow_up: AskResponse | None,
+        files: dict[str, FileContent] | None,
         stream: bool,
         incognito: bool,
     ) -> AskResponse | Iterator[AskResponse]:
         """Execute perplexity_ask request"""
-        # Build request
-        request = self._build_request(
+        attachments = self._upload_files(files) if files else None
+
+        headers, body = self._prepare(
             query=query,
             mode=mode,
             model=model,
             sources=sources,
             follow_up=follow_up,
+            stream=stream,
             incognito=incognito,
+            attachments=attachments,
         )
 
-        # Generate headers
-        headers = self.header_gen.request_headers(sse=True)
-        headers.update(self.auth.to_headers())
+        if stream:
+            # Events are decoded as they arrive. curl_cffi runs a streamed
+            # request on a copy of the session's curl handle, so it opens a
+            # connection of its own
+            response = self.session.post(
+                self.ENDPOINT,
+                headers=headers,
+                data=body,
+                stream=True,
+                timeout=60,
+            )
 
-        # Make request
+            try:
+                response.raise_for_status()
+            except Exception:
+                response.close()
+                raise
+
+            return self._stream_sse_response(response)
+
+        # Buffered requests run on the session's own handle and reuse its
+        # kept-alive connection
         response = self.session.post(
             self.ENDPOINT,
             headers=headers,
-            json_data=request.model_dump(mode="json", exclude_none=True),
+            data=body,
             timeout=60,
         )
-
         response.raise_for_status()
+        return self._parse_sse_body(response.content)
+
+
+class AsyncAskEndpoint(AskEndpoint):
+    """Asyncio handler for /rest/sse/perplexity_ask endpoint"""
+
+    async def _aupload_files(self, files: dict[str, FileContent]) -> list[str]:
+        """Upload files and return their attachment URLs"""
+        headers = self._headers(self._api_headers)
+        params = {"version": self.header_gen.API_VERSION, "source": "default"}
+        attachments = []
+
+        for filename, content in files.items():
+            body, part = self._upload_info_request(filename, content)
+            response = await self.session.post(
+                self.UPLOAD_ENDPOINT, headers=headers, params=params, json=body, timeout=30
+            )
+            response.raise_for_status()
+            info = response.json()
+
+            form = self._upload_form(info, part)
+            try:
+                upload = await self.session.post_multipart(
+                    info["s3_bucket_url"], form, timeout=self.UPLOAD_TIMEOUT
+                )
+                upload.raise_for_status()
+            finally:
+                form.close()
+
+            attachments.append(self._uploaded_url(info, upload))
+
+        return attachments
+
+    async def _aiter_sse_bytes(self, response) -> AsyncIterator[bytes]:
+        """Iterate raw response body chunks, closing the response when done"""
+        try:
+            async for raw in response.aiter_content():
+                yield raw
+        finally:
+            await response.aclose()
+
+    async def _aiter_sse_events(self, response) -> AsyncIterator[dict[str, Any]]:
+        """Decode SSE event payloads as body chunks arrive"""
+        parser = SSEParser()
+
+        async for raw in self._aiter_sse_bytes(response):
+            for data in self._decode_chunk(parser, raw):
+                yield data
+        for data in self._decode_chunk(parser, b"", final=True):
+            yield data
+
+    async def _astream_sse_response(self, response) -> AsyncIterator[AskResponse]:
+        """Stream SSE response as async iterator"""
+        prev_len = 0
+
+        async for data in self._aiter_sse_events(response):
+            # Skip non-object frames (e.g. list elements like "ping")
+            if not isinstance(data, dict):
+                continue
+            # Server sends cumulative text, yield only the delta
+            text = data.get("text")
+            if isinstance(text, str) and len(text) > prev_len:
+                yield self._event_response(data, text[prev_len:])
+                prev_len = len(text)
+
+    async def ask(
+        self,
+        query: str,
+        mode: Mode | str,
+        model: Model | str | None,
+        sources: list[Source | str] | None,
+        follow_up: AskResponse | None,
+        files: dict[str, FileContent] | None,
+        stream: bool,
+        incognito: bool,
+    ) -> AskResponse | AsyncIterator[AskResponse]:
+        """Execute perplexity_ask request"""
+        attachments = await self._aupload_files(files) if files else None
+
+        headers, body = self._prepare(
+            query=query,
+            mode=mode,
+            model=model,
+            sources=sources,
+            follow_up=follow_up,
+            stream=stream,
+            incognito=incognito,
+            attachments=attachments,
+        )
 
-        # Parse response
         if stream:
-            return self._stream_sse_response(response.text)
-        else:
-            return self._parse_sse_response(response.text)
+            response = await self.session.post(
+                self.ENDPOINT,
+                headers=headers,
+                data=body,
+                stream=True,
+                timeout=60,
+            )
+
+            try:
+                response.raise_for_status()
+            except Exception:
+                await response.aclose()
+                raise
+
+            return self._astream_sse_response(response)
+
+        response = await self.session.post(
+            self.ENDPOINT,
+            headers=headers,
+            data=body,
+            timeout=60,
+        )
+        response.raise_for_status()
+        return self._parse_sse_body(response.content)
@@ -10,8 +10,8 @@ from perplexity_ai.models.request import (
 )
 from perplexity_ai.models.response import (
     AskResponse,
-    SSEMessage,
     PlanBlock,
+    SSEMessage,
 )
 
 __all__ = [
@@ -4,13 +4,13 @@ Request models for Perplexity AI API
 
 from __future__ import annotations
 
-from enum import Enum
-from typing import Dict, List, Optional
-from pydantic import BaseModel, Field
+from enum import StrEnum
 from uuid import uuid4
 
+from pydantic import BaseModel, Field
+
 
-class Mode(str, Enum):
+class Mode(StrEnum):
     """Query mode"""
 
     CONCISE = "concise"
@@ -18,7 +18,7 @@ class Mode(str, Enum):
     RESEARCH = "research"
 
 
-class Model(str, Enum):
+class Model(StrEnum):
     """AI Model selection"""
 
     PPLX_PRO = "pplx_pro"
@@ -32,7 +32,7 @@ class Model(str, Enum):
     GROK = "grok-2"
 
 
-class Source(str, Enum):
+class Source(StrEnum):
     """Search source"""
 
     WEB = "web"
@@ -40,13 +40,20 @@ class Source(str, Enum):
     SOCIAL = "social"
 
 
+# Value -> member lookups for coercing user input on the request hot path.
+# Members hash like their values, so passing a member works too.
+_MODE_LOOKUP: dict[str, Mode] = {m.value: m for m in Mode}
+_MODEL_LOOKUP: dict[str, Model] = {m.value: m for m in Model}
+_SOURCE_LOOKUP: dict[str, Source] = {s.value: s for s in Source}
+
+
 class AskParams(BaseModel):
     """Parameters for perplexity_ask request"""
 
-    read_write_token: Optional[str] = None
+    read_write_token: str | None = None
     is_voice_to_voice: bool = False
     model_preference: Model = Model.PPLX_PRO
-    supported_block_use_cases: List[str] = Field(
+    supported_block_use_cases: list[str] = Field(
         default_factory=lambda: [
             "answer_modes",
             "media_items",
@@ -71,12 +78,13 @@ class AskParams(BaseModel):
     frontend_uuid: str = Field(default_factory=lambda: str(uuid4()))
     language: str = "ru-RU"
     timezone: str = "Europe/Moscow"
-    user_nextauth_id: Optional[str] = None
+    user_nextauth_id: str | None = None
     frontend_context_uuid: str = Field(default_factory=lambda: str(uuid4()))
-    sources: List[Source] = Field(default_factory=lambda: [Source.WEB])
+    sources: list[Source] = Field(default_factory=lambda: [Source.WEB])
     use_schematized_api: bool = True
     is_incognito: bool = False
-    last_backend_uuid: Optional[str] = None
+    last_backend_uuid: str | None = None
+    attachments: list[str] = Field(default_factory=list)
 
 
 class AskRequest(BaseModel):
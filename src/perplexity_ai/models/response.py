@@ -4,12 +4,14 @@ Response models for Perplexity AI API
 
 from __future__ import annotations
 
-from enum import Enum
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field, fields
+from enum import StrEnum
+from typing import Any
+
 from pydantic import BaseModel, Field
 
 
-class StepType(str, Enum):
+class StepType(StrEnum):
     """Type of search step"""
 
     INITIAL_QUERY = "INITIAL_QUERY"
@@ -23,15 +25,15 @@ class SearchStep(BaseModel):
 
     uuid: str = ""
     step_type: StepType
-    initial_query_content: Optional[Dict[str, str]] = None
+    initial_query_content: dict[str, str] | None = None
 
 
 class PlanBlock(BaseModel):
     """Search plan with steps"""
 
     progress: str = "IN_PROGRESS"
-    goals: List[str] = Field(default_factory=list)
-    steps: List[SearchStep] = Field(default_factory=list)
+    goals: list[str] = Field(default_factory=list)
+    steps: list[SearchStep] = Field(default_factory=list)
     final: bool = False
 
 
@@ -39,11 +41,18 @@ class Block(BaseModel):
     """Response block"""
 
     intended_usage: str
-    plan_block: Optional[PlanBlock] = None
+    plan_block: PlanBlock | None = None
+
 
+@dataclass(slots=True, kw_only=True)
+class SSEMessage:
+    """SSE event message
 
-class SSEMessage(BaseModel):
-    """SSE event message"""
+    A plain dataclass rather than a Pydantic model: one is built for every
+    streamed event, and most fields are only carried along. Payloads are
+    trusted as sent by the server; use from_dict to build one from decoded
+    JSON. blocks holds the raw block dicts, see Block for their shape.
+    """
 
     backend_uuid: str
     context_uuid: str
@@ -57,27 +66,47 @@ class SSEMessage(BaseModel):
     expect_search_results: str
     gpt4: bool
     text_completed: bool
-    blocks: List[Block] = Field(default_factory=list)
+    blocks: list[dict[str, Any]] = field(default_factory=list)
     message_mode: str = "STREAMING"
-    answer_modes: List[str] = Field(default_factory=list)
+    answer_modes: list[str] = field(default_factory=list)
     reconnectable: bool = True
-    image_completions: List[str] = Field(default_factory=list)
-    cursor: Optional[str] = None
+    image_completions: list[str] = field(default_factory=list)
+    cursor: str | None = None
     status: str = "PENDING"
     final_sse_message: bool = False
     text: str = ""  # Accumulated text
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> SSEMessage:
+        """Create message from decoded event payload
+
+        Unknown keys are ignored. Only the shape the parser relies on is
+        checked: the payload must be an object and text a string.
+
+        Raises:
+            TypeError: If the payload is not an object, text is not a
+                string, or a required field is missing
+        """
+        if not isinstance(data, dict):
+            raise TypeError(f"SSE payload is not an object: {type(data).__name__}")
+        if not isinstance(data.get("text", ""), str):
+            raise TypeError("SSE payload text is not a string")
+        return cls(**{k: v for k, v in data.items() if k in _SSE_MESSAGE_FIELDS})
+
+
+_SSE_MESSAGE_FIELDS = frozenset(f.name for f in fields(SSEMessage))
+
 
 class AskResponse(BaseModel):
     """Final response from perplexity_ask"""
 
     text: str = Field(..., description="Answer text")
-    sources: List[Dict[str, Any]] = Field(
+    sources: list[dict[str, Any]] = Field(
         default_factory=list, description="Source citations"
     )
-    thread_uuid: Optional[str] = Field(None, description="Thread UUID for follow-ups")
-    backend_uuid: Optional[str] = Field(None, description="Backend UUID")
-    context_uuid: Optional[str] = Field(None, description="Context UUID")
-    thread_url_slug: Optional[str] = Field(None, description="Thread URL slug")
-    mode: Optional[str] = Field(None, description="Response mode")
-    model: Optional[str] = Field(None, description="Model used")
+    thread_uuid: str | None = Field(None, description="Thread UUID for follow-ups")
+    backend_uuid: str | None = Field(None, description="Backend UUID")
+    context_uuid: str | None = Field(None, description="Context UUID")
+    thread_url_slug: str | None = Field(None, description="Thread URL slug")
+    mode: str | None = Field(None, description="Response mode")
+    model: str | None = Field(None, description="Model used")
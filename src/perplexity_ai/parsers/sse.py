@@ -2,106 +2,161 @@
 
 from __future__ import annotations
 
-import json
-from typing import Any, Generator, Optional
+from collections.abc import Generator
+from typing import Any
+
+from perplexity_ai.utils import _json
 
 
 class SSEEvent:
     """Single SSE event."""
-    
+
     def __init__(self, event: str, data: dict[str, Any]):
         self.event = event
         self.data = data
         self.step_type = data.get('step_type')
-    
+
     def is_final(self) -> bool:
         """Check if this is the FINAL step with answer."""
         return self.step_type == 'FINAL'
-    
+
     def __repr__(self) -> str:
         return f"SSEEvent(event='{self.event}', step_type='{self.step_type}')"
 
 
 class SSEParser:
     """Streaming SSE parser with buffer support.
-    
+
     Handles Perplexity's SSE format:
     - Multiple events per response
     - Nested JSON in 'answer' field (CRITICAL!)
     - List or dict data formats
     """
-    
-    def __init__(self):
-        self.buffer = ""
+
+    def __init__(self, keep_events: bool = True):
+        """Initialize parser.
+
+        Args:
+            keep_events: Store every fed event in self.events (needed for
+                extract_answer() without arguments). Streaming callers that
+                consume events as they come should pass False.
+        """
+        self.buffer = bytearray()
+        # Length of the buffered prefix already searched for line ends
+        self._scanned = 0
         self.events: list[SSEEvent] = []
-    
-    def feed(self, chunk: str) -> Generator[SSEEvent, None, None]:
+        self.keep_events = keep_events
+
+    def feed(self, chunk: bytes | str) -> Generator[SSEEvent, None, None]:
         """Feed chunk of data and yield parsed events.
-        
+
+        Bytes are buffered as-is and JSON is decoded straight from them,
+        so callers can pass raw network chunks without decoding first.
+
         Args:
-            chunk: Raw SSE text chunk
-            
+            chunk: Raw SSE chunk (bytes, or already decoded text)
+
         Yields:
             Parsed SSEEvent objects
         """
-        self.buffer += chunk
-        
-        while '\n' in self.buffer:
-            line, self.buffer = self.buffer.split('\n', 1)
-            
-            if line.startswith('data: '):
-                try:
-                    data = json.loads(line[6:])
-                    
+        for event_data in self.feed_data(chunk):
+            event = SSEEvent('message', event_data)
+            if self.keep_events:
+                self.events.append(event)
+            yield event
+
+    def feed_data(self, chunk: bytes | str) -> Generator[dict[str, Any], None, None]:
+        """Feed chunk of data and yield decoded event payloads.
+
+        Same as feed() without wrapping payloads in SSEEvent or storing
+        them, for callers that build their own objects from the dicts.
+
+        Args:
+            chunk: Raw SSE chunk (bytes, or already decoded text)
+
+        Yields:
+            Event data dicts
+        """
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+
+        buf = self.buffer
+        # Only bytes not searched by an earlier call need scanning; that is
+        # all of the leftover unless a caller stopped reading early
+        scan_from = self._scanned
+        buf.extend(chunk)
+        pos = 0
+
+        try:
+            while (idx := buf.find(b'\n', scan_from)) >= 0:
+                start = pos
+                pos = scan_from = idx + 1
+
+                # Check the prefix in place (it has no newline, so it can not
+                # run past this line) and copy out only the JSON payload
+                if buf.startswith(b'data: ', start):
+                    try:
+                        data = _json.loads(buf[start + 6:idx])
+                    except ValueError:
+                        continue
+
                     # Support both list and dict
-                    events_data = data if isinstance(data, list) else [data]
-                    
-                    for event_data in events_data:
-                        event = SSEEvent('message', event_data)
-                        self.events.append(event)
-                        yield event
-                        
-                except json.JSONDecodeError:
-                    continue
-    
-    def parse_complete(self, text: str) -> list[SSEEvent]:
+                    if isinstance(data, list):
+                        yield from data
+                    else:
+                        yield data
+
+            # No line end left, so the rest is a partial line
+            scan_from = len(buf)
+        finally:
+            # Drop consumed lines with a single memmove per chunk
+            del buf[:pos]
+            self._scanned = scan_from - pos
+
+    def parse_complete(self, text: bytes | str) -> list[SSEEvent]:
         """Parse complete SSE response (non-streaming).
-        
+
+        Pass ``response.content`` rather than ``response.text`` to skip
+        charset detection; the body is always UTF-8.
+
         Args:
-            text: Complete SSE response text
-            
+            text: Complete SSE response body (bytes or text)
+
         Returns:
             List of parsed events
         """
+        if isinstance(text, str):
+            text = text.encode('utf-8')
+
         events = []
-        
-        for line in text.split('\n'):
-            if not line.startswith('data: '):
+
+        for line in text.split(b'\n'):
+            if not line.startswith(b'data: '):
                 continue
-            
+
             try:
-                data = json.loads(line[6:])
-                
+                data = _json.loads(line[6:])
+
                 events_data = data if isinstance(data, list) else [data]
-                
+
                 for event_data in events_data:
                     events.append(SSEEvent('message', event_data))
-                    
-            except json.JSONDecodeError:
+
+            except ValueError:
                 continue
-        
+
         return events
-    
-    def extract_answer(self, events: Optional[list[SSEEvent]] = None) -> dict[str, Any]:
+
+    def extract_answer(self, events: list[SSEEvent] | None = None) -> dict[str, Any]:
         """Extract final answer from events.
-        
+
         CRITICAL: Perplexity returns nested JSON!
         step['content']['answer'] is a JSON STRING, not object.
         Must decode twice: json.loads(json.loads(...))
-        
+
         Args:
             events: List of events (uses self.events if None)
-            
+
         Returns:
             Dict with:
                 - text: Final answer text
@@ -109,38 +164,39 @@ class SSEParser:
                 - structured_answer: Structured data (if any)
         """
         events = events or self.events
-        
+
         for event in events:
             if event.is_final():
                 content = event.data.get('content', {})
                 answer_str = content.get('answer', '')
-                
+
                 if answer_str:
                     try:
                         # CRITICAL: Double JSON decode!
                         # answer_str is a JSON string containing the real answer
-                        answer_obj = json.loads(answer_str)
-                        
+                        answer_obj = _json.loads(answer_str)
+
                         return {
                             'text': answer_obj.get('answer', ''),
                             'web_results': answer_obj.get('web_results', []),
                             'structured_answer': answer_obj.get('structured_answer'),
                         }
-                    except json.JSONDecodeError:
+                    except ValueError:
                         # Fallback: return raw string
                         return {
                             'text': answer_str,
                             'web_results': [],
                             'structured_answer': None,
                         }
-        
+
         return {
             'text': '',
             'web_results': [],
             'structured_answer': None,
         }
-    
+
     def reset(self):
         """Reset parser state."""
-        self.buffer = ""
+        self.buffer = bytearray()
+        self._scanned = 0
         self.events = []
@@ -2,68 +2,83 @@
 
 from __future__ import annotations
 
+import threading
+import time
 import warnings
+from functools import cache
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType, ModuleType
+from typing import TYPE_CHECKING, ClassVar
 
-try:
+from .stealth.fingerprint import BrowserFingerprint
+
+if TYPE_CHECKING:
     from curl_cffi import requests
-except ImportError:
-    raise ImportError(
-        "curl_cffi is required for session management.\n"
-        "Install with: pip install curl-cffi>=0.7.0"
-    )
 
-from .stealth.fingerprint import BrowserFingerprint
 
+class BasePerplexitySession:
+    """Fingerprint, headers and cookies shared by the sync and async sessions.
 
-class PerplexitySession:
-    """Perplexity API session with curl_cffi and fingerprint support.
-    
-    Automatically handles:
-    - Browser fingerprinting (from daemon or generated)
-    - curl_cffi impersonation
-    - Header generation
-    - Cookie management
-    
-    Example:
-        >>> # Auto-load from daemon
-        >>> session = PerplexitySession()
-        >>> 
-        >>> # Use custom fingerprint
-        >>> fp = BrowserFingerprint.generate_realistic()
-        >>> session = PerplexitySession(fingerprint=fp)
+    Subclasses add the curl_cffi transport and the request methods.
     """
-    
+
+    BASE_URL = 'https://www.perplexity.ai'
     DEFAULT_ARTIFACT_PATH = 'artifacts/browser-fingerprint.json'
-    
+
+    # Keep connections warm between asks so TLS is negotiated once, and
+    # push SSE bytes through as soon as they arrive. Keys are CurlOpt
+    # member names, resolved when a curl session is built so curl_cffi
+    # is not imported before it is needed.
+    CURL_OPTIONS = {
+        'TCP_KEEPALIVE': 1,
+        'TCP_KEEPIDLE': 60,
+        'TCP_NODELAY': 1,
+        'BUFFERSIZE': 102400,
+        'FORBID_REUSE': 0,
+        'MAXCONNECTS': 32,
+    }
+
+    # Read-only: merged into every instance's headers, never mutated
+    STATIC_HEADERS = MappingProxyType({
+        'Accept': 'text/event-stream',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'Content-Type': 'application/json',
+        'Sec-Fetch-Dest': 'empty',
+        'Sec-Fetch-Mode': 'cors',
+        'Sec-Fetch-Site': 'same-origin',
+        'Origin': 'https://www.perplexity.ai',
+        'Referer': 'https://www.perplexity.ai/',
+    })
+
     def __init__(
         self,
-        fingerprint: Optional[BrowserFingerprint] = None,
-        cookies: Optional[dict[str, str]] = None,
+        fingerprint: BrowserFingerprint | None = None,
+        cookies: dict[str, str] | None = None,
         auto_load_fingerprint: bool = True,
     ):
-        """Initialize session.
-        
+        """Initialize fingerprint, headers and cookies.
+
         Args:
             fingerprint: Custom fingerprint (optional)
             cookies: Initial cookies dict
             auto_load_fingerprint: Auto-load from daemon artifact if exists
         """
         self.cookies = cookies or {}
-        
+
         # Load or generate fingerprint
         if fingerprint is None:
             fingerprint = self._load_or_generate_fingerprint(auto_load_fingerprint)
-        
+
         self.fingerprint = fingerprint
-        self._session = self._create_curl_session()
-    
+        # Wall-clock epoch of the fingerprint, so get_info() only needs time.time()
+        self._fp_created_at = fingerprint.timestamp.timestamp()
+        self.headers = self._session_headers()
+
     def _load_or_generate_fingerprint(self, auto_load: bool) -> BrowserFingerprint:
         """Load fingerprint from daemon or generate."""
         if auto_load:
             artifact_path = Path(self.DEFAULT_ARTIFACT_PATH)
-            
+
             if artifact_path.exists():
                 try:
                     return BrowserFingerprint.from_daemon_artifact(artifact_path)
@@ -73,43 +88,54 @@ class PerplexitySession:
                         "Generating new one.",
                         UserWarning
                     )
-        
+
         # Generate fallback
         return BrowserFingerprint.generate_realistic()
-    
-    def _create_curl_session(self) -> requests.Session:
-        """Create curl_cffi session with fingerprint."""
-        headers = {
-            **self.fingerprint.to_headers(),
-            'Accept': 'text/event-stream',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Content-Type': 'application/json',
-            'Sec-Fetch-Dest': 'empty',
-            'Sec-Fetch-Mode': 'cors',
-            'Sec-Fetch-Site': 'same-origin',
-            'Origin': 'https://www.perplexity.ai',
-            'Referer': 'https://www.perplexity.ai/',
-        }
-        
-        return requests.Session(
-            headers=headers,
-            cookies=self.cookies,
-            impersonate=self.fingerprint.impersonate_profile
+
+    def _session_headers(self) -> dict[str, str]:
+        """Build default session headers from fingerprint."""
+        # to_headers() hands back a fresh dict; extend it in place
+        headers = self.fingerprint.to_headers()
+        headers.update(self.STATIC_HEADERS)
+        return headers
+
+    @classmethod
+    def _build_curl_session(cls, session_cls: type, impersonate: str):
+        """Create bare curl_cffi session for an impersonate profile.
+
+        No headers or cookies are stored on it; the session wrapper sends
+        its own with every request, so one curl session can serve many
+        wrappers. Response cookies are kept out of its jar for the same
+        reason and collected by the wrapper instead.
+        """
+        curl_opt = _curl_cffi().CurlOpt
+        return session_cls(
+            base_url=cls.BASE_URL,
+            impersonate=impersonate,
+            curl_options={curl_opt[name]: value for name, value in cls.CURL_OPTIONS.items()},
+            discard_cookies=True,
         )
-    
-    def post(self, url: str, **kwargs) -> requests.Response:
-        """POST request."""
-        return self._session.post(url, **kwargs)
-    
-    def get(self, url: str, **kwargs) -> requests.Response:
-        """GET request."""
-        return self._session.get(url, **kwargs)
-    
+
+    def _request_kwargs(self, kwargs: dict) -> dict:
+        """Merge instance headers and cookies into request kwargs."""
+        headers = kwargs.get('headers')
+        kwargs['headers'] = {**self.headers, **headers} if headers else self.headers
+        # Always hand curl_cffi a snapshot: with requests in flight on
+        # several threads, _store_cookies() may update self.cookies while
+        # another request is still iterating over them
+        cookies = kwargs.get('cookies')
+        kwargs['cookies'] = {**self.cookies, **cookies} if cookies else self.cookies.copy()
+        return kwargs
+
+    def _store_cookies(self, response: requests.Response) -> None:
+        """Keep cookies set by the server for later requests."""
+        for cookie in response.cookies.jar:
+            self.cookies[cookie.name] = cookie.value
+
     def update_cookies(self, cookies: dict[str, str]):
         """Update session cookies."""
         self.cookies.update(cookies)
-        self._session.cookies.update(cookies)
-    
+
     def get_info(self) -> dict:
         """Get session info."""
         return {
@@ -119,15 +145,292 @@ class PerplexitySession:
             'canvas_hash': self.fingerprint.canvas_hash,
             'cookies_count': len(self.cookies),
             'fingerprint_source': self.fingerprint.source,
-            'fingerprint_age_hours': (
-                (datetime.now() - self.fingerprint.timestamp).total_seconds() / 3600
-            ),
+            'fingerprint_age_hours': (time.time() - self._fp_created_at) / 3600,
         }
-    
+
+
+class PerplexitySession(BasePerplexitySession):
+    """Perplexity API session with curl_cffi and fingerprint support.
+
+    Automatically handles:
+    - Browser fingerprinting (from daemon or generated)
+    - curl_cffi impersonation
+    - Header generation
+    - Cookie management
+
+    By default the underlying curl_cffi session is shared process-wide
+    with every other PerplexitySession using the same impersonate
+    profile (see get_shared_session), so connections and TLS sessions
+    are reused across clients. That holds for regular requests only: with
+    stream=True curl_cffi runs the request on a copy of the curl handle,
+    which opens a connection of its own. Headers and cookies stay per
+    instance and are sent with each request. get_shared() goes one step
+    further and returns a single process-wide PerplexitySession.
+
+    Example:
+        >>> # Auto-load from daemon
+        >>> session = PerplexitySession()
+        >>>
+        >>> # Use custom fingerprint
+        >>> fp = BrowserFingerprint.generate_realistic()
+        >>> session = PerplexitySession(fingerprint=fp)
+        >>>
+        >>> # Private connection pool
+        >>> session = PerplexitySession(share=False)
+        >>>
+        >>> # One session for the whole process
+        >>> with PerplexitySession.get_shared() as session:
+        ...     session.get('/')
+    """
+
+    _shared: ClassVar[PerplexitySession | None] = None
+
+    def __init__(
+        self,
+        fingerprint: BrowserFingerprint | None = None,
+        cookies: dict[str, str] | None = None,
+        auto_load_fingerprint: bool = True,
+        share: bool = True,
+    ):
+        """Initialize session.
+
+        Args:
+            fingerprint: Custom fingerprint (optional)
+            cookies: Initial cookies dict
+            auto_load_fingerprint: Auto-load from daemon artifact if exists
+            share: Use the process-wide curl session for this profile
+        """
+        super().__init__(fingerprint, cookies, auto_load_fingerprint)
+        self.shared = share
+
+        if share:
+            self._session = get_shared_session(self.fingerprint.impersonate_profile)
+        else:
+            self._session = self._create_curl_session()
+
+    @classmethod
+    def get_shared(cls) -> PerplexitySession:
+        """Get the process-wide session, creating it on first call.
+
+        Every caller gets the same instance, so its fingerprint, headers
+        and cookies are shared too: update_cookies() on it is seen by all
+        users. Closing it (or leaving a ``with`` block) keeps it open.
+
+        Returns:
+            Shared PerplexitySession
+        """
+        shared = cls.__dict__.get('_shared')
+        if shared is None:
+            with _SHARED_LOCK:
+                shared = cls.__dict__.get('_shared')
+                if shared is None:
+                    shared = cls()
+                    cls._shared = shared
+        return shared
+
+    def _create_curl_session(self) -> requests.Session:
+        """Create dedicated curl_cffi session with fingerprint."""
+        return self._build_curl_session(
+            _curl_cffi().requests.Session, self.fingerprint.impersonate_profile
+        )
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """POST request."""
+        response = self._session.post(url, **self._request_kwargs(kwargs))
+        self._store_cookies(response)
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET request."""
+        response = self._session.get(url, **self._request_kwargs(kwargs))
+        self._store_cookies(response)
+        return response
+
+    def post_multipart(self, url: str, multipart, **kwargs) -> requests.Response:
+        """POST multipart form to an external URL (e.g. file upload bucket).
+
+        Sent without the perplexity.ai API headers and cookies.
+        """
+        return self._session.post(url, multipart=multipart, **kwargs)
+
+    def warmup(self, timeout: float = 5) -> bool:
+        """Open the connection to perplexity.ai ahead of the first request.
+
+        Sends a HEAD to the site root so DNS, TCP and the TLS handshake are
+        done (and Cloudflare cookies collected) before anything latency
+        sensitive. curl_cffi keeps one curl handle per thread, so this warms
+        the connection of the calling thread only, and only regular requests
+        use it: stream=True requests run on a copy of the handle and connect
+        afresh.
+
+        Args:
+            timeout: Request timeout in seconds
+
+        Returns:
+            True if the server answered, False on any network error
+        """
+        try:
+            response = self._session.head('/', **self._request_kwargs({'timeout': timeout}))
+        except _curl_cffi().requests.RequestsError:
+            return False
+        self._store_cookies(response)
+        return True
+
     def close(self):
-        """Close session."""
-        if hasattr(self._session, 'close'):
+        """Close session.
+
+        The shared curl session stays open for other users.
+        """
+        if self.shared:
+            return
+        try:
             self._session.close()
+        except AttributeError:
+            pass
+
+    def __enter__(self) -> PerplexitySession:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+@cache
+def _curl_cffi() -> ModuleType:
+    """Import curl_cffi on first use.
+
+    It loads libcurl and its CFFI bindings, which is slow, so importing
+    this module (e.g. for HeaderGenerator or type hints) does not pull it in.
+    """
+    try:
+        import curl_cffi
+        import curl_cffi.requests
+    except ImportError:
+        raise ImportError(
+            "curl_cffi is required for session management.\n"
+            "Install with: pip install curl-cffi>=0.7.0"
+        )
+    return curl_cffi
+
+
+@cache
+def libcurl_has_zstd() -> bool:
+    """Whether the bundled libcurl was built with zstd decoding."""
+    return b'zstd/' in _curl_cffi().Curl().version()
+
+
+_DEFAULT_SESSIONS: dict[str, requests.Session] = {}
+_SHARED_LOCK = threading.RLock()
+
+
+def get_shared_session(impersonate: str) -> requests.Session:
+    """Get process-wide curl_cffi session for an impersonate profile.
+
+    Created on first use and kept open for the life of the process, so
+    every PerplexitySession with the same profile reuses its connections.
+    Safe to call from several threads at once; only one session is ever
+    created per profile.
+
+    The profile alone is the key: user agent, other headers and cookies
+    are sent per request by each PerplexitySession, never stored on the
+    curl session.
+
+    Args:
+        impersonate: curl_cffi impersonate profile (e.g. "chrome120")
+
+    Returns:
+        Shared curl_cffi Session
+    """
+    session = _DEFAULT_SESSIONS.get(impersonate)
+    if session is None:
+        with _SHARED_LOCK:
+            session = _DEFAULT_SESSIONS.get(impersonate)
+            if session is None:
+                session = PerplexitySession._build_curl_session(
+                    _curl_cffi().requests.Session, impersonate
+                )
+                _DEFAULT_SESSIONS[impersonate] = session
+    return session
+
+
+class AsyncPerplexitySession(BasePerplexitySession):
+    """Asyncio variant of PerplexitySession backed by curl_cffi AsyncSession.
+
+    Fingerprint loading, headers and cookies behave exactly like
+    PerplexitySession; only the transport is asynchronous. A single
+    AsyncSession drives all requests from one event loop, so concurrent
+    asks do not need a thread (and curl handle) each.
+
+    Example:
+        >>> async with AsyncPerplexitySession() as session:
+        ...     response = await session.get('/')
+    """
+
+    # libcurl multiplexes HTTP/2 streams by default; PIPEWAIT makes requests
+    # started while the first connection is still being set up wait for it
+    # instead of each opening (and handshaking) a connection of their own
+    CURL_OPTIONS = {
+        **BasePerplexitySession.CURL_OPTIONS,
+        'PIPEWAIT': 1,
+    }
+
+    def __init__(
+        self,
+        fingerprint: BrowserFingerprint | None = None,
+        cookies: dict[str, str] | None = None,
+        auto_load_fingerprint: bool = True,
+    ):
+        """Initialize session.
+
+        Async sessions are bound to an event loop, so they are never shared.
+
+        Args:
+            fingerprint: Custom fingerprint (optional)
+            cookies: Initial cookies dict
+            auto_load_fingerprint: Auto-load from daemon artifact if exists
+        """
+        super().__init__(fingerprint, cookies, auto_load_fingerprint)
+        self._session = self._create_curl_session()
+
+    def _create_curl_session(self) -> requests.AsyncSession:
+        """Create curl_cffi async session with fingerprint."""
+        return self._build_curl_session(
+            _curl_cffi().requests.AsyncSession, self.fingerprint.impersonate_profile
+        )
+
+    async def post(self, url: str, **kwargs) -> requests.Response:
+        """POST request."""
+        response = await self._session.post(url, **self._request_kwargs(kwargs))
+        self._store_cookies(response)
+        return response
+
+    async def get(self, url: str, **kwargs) -> requests.Response:
+        """GET request."""
+        response = await self._session.get(url, **self._request_kwargs(kwargs))
+        self._store_cookies(response)
+        return response
+
+    async def post_multipart(self, url: str, multipart, **kwargs) -> requests.Response:
+        """POST multipart form to an external URL (e.g. file upload bucket)."""
+        return await self._session.post(url, multipart=multipart, **kwargs)
+
+    async def warmup(self, timeout: float = 5) -> bool:
+        """Open the connection to perplexity.ai ahead of the first request."""
+        try:
+            response = await self._session.head(
+                '/', **self._request_kwargs({'timeout': timeout})
+            )
+        except _curl_cffi().requests.RequestsError:
+            return False
+        self._store_cookies(response)
+        return True
+
+    async def close(self):
+        """Close session."""
+        await self._session.close()
 
+    async def __aenter__(self) -> AsyncPerplexitySession:
+        return self
 
-from datetime import datetime
+    async def __aexit__(self, *args) -> None:
+        await self.close()
@@ -1,5 +1,6 @@
 """Stealth mode utilities."""
 
 from .fingerprint import BrowserFingerprint, ScreenInfo, WebGLInfo
+from .headers import HeaderGenerator
 
-__all__ = ['BrowserFingerprint', 'ScreenInfo', 'WebGLInfo']
+__all__ = ['BrowserFingerprint', 'HeaderGenerator', 'ScreenInfo', 'WebGLInfo']
@@ -2,37 +2,120 @@
 
 from __future__ import annotations
 
-import hashlib
-import json
 import random
 import re
+import secrets
+import threading
 import warnings
+from collections.abc import Mapping
 from datetime import datetime, timedelta
+from functools import cached_property
 from pathlib import Path
-from typing import Literal, Optional
+from typing import Any, Literal, TypedDict
 
 from pydantic import BaseModel, Field, field_validator
 
+from perplexity_ai.utils._json import loads as _loads
+
+_CHROME_RE = re.compile(r'Chrome/(\d+)')
+
+_PLATFORM_NAMES = {
+    "Win32": "Windows",
+    "Windows": "Windows",
+    "MacIntel": "macOS",
+    "macOS": "macOS",
+    "Linux x86_64": "Linux",
+    "Linux": "Linux",
+}
+
+# generate_realistic() pools
+_CHROME_VERSIONS = (120, 121, 122, 123, 124, 125, 126)
+
+# OS name -> (navigator.platform, User-Agent OS token)
+_PLATFORMS = {
+    "Windows": ("Win32", "Windows NT 10.0; Win64; x64"),
+    "macOS": ("MacIntel", "Macintosh; Intel Mac OS X 10_15_7"),
+    "Linux": ("Linux x86_64", "X11; Linux x86_64"),
+}
+_OS_NAMES = tuple(_PLATFORMS)
+
+# Realistic screen resolutions
+_RESOLUTIONS = (
+    (1920, 1080), (2560, 1440), (3840, 2160),
+    (1366, 768), (1440, 900), (2880, 1800),
+)
+
+# WebGL (vendor, renderer)
+_WEBGL_CONFIGS = (
+    ("Google Inc. (NVIDIA)", "ANGLE (NVIDIA, NVIDIA GeForce RTX 3080)"),
+    ("Google Inc. (Intel)", "ANGLE (Intel, Intel(R) UHD Graphics 630)"),
+    ("Google Inc. (AMD)", "ANGLE (AMD, AMD Radeon RX 6800 XT)"),
+)
+
+_HARDWARE_CONCURRENCY = (8, 12, 16)
+_DEVICE_MEMORY = (8, 16, 32)
+
+# BrowserFingerprint cached_property names, cleared by model_copy(update=...)
+_CACHED_PROPERTIES = ('chrome_version', 'impersonate_profile', 'platform_name', '_headers')
+
+_tls = threading.local()
+
+
+def _rng() -> random.Random:
+    """Per-thread generator, so bulk generation in threads shares no state."""
+    rng = getattr(_tls, 'rng', None)
+    if rng is None:
+        rng = _tls.rng = random.Random()
+    return rng
+
+
+class ScreenArtifact(TypedDict, total=False):
+    """Screen section of a daemon fingerprint artifact."""
+    width: int
+    height: int
+    colorDepth: int
+
+
+class FingerprintArtifact(TypedDict):
+    """browser-fingerprint.json as written by tools/browser_daemon.py.
+
+    Static typing only; nothing is checked at runtime.
+    """
+    timestamp: str
+    user_agent: str
+    platform: str
+    language: str
+    screen: ScreenArtifact
+    timezone: str
+    hardware_concurrency: int
+    device_memory: int | None
+    canvas_hash: str
+    webgl_vendor: str | None
+    webgl_renderer: str | None
+    cookies_count: int
+
 
 class ScreenInfo(BaseModel):
     """Screen information."""
     width: int = Field(ge=800, le=7680)
     height: int = Field(ge=600, le=4320)
-    colorDepth: int = Field(default=24, ge=8, le=32)
+    colorDepth: int = Field(default=24, ge=8, le=32)  # noqa: N815 - screen.colorDepth in JS
 
 
 class WebGLInfo(BaseModel):
     """WebGL information."""
-    vendor: Optional[str] = None
-    renderer: Optional[str] = None
+    vendor: str | None = None
+    renderer: str | None = None
 
 
 class BrowserFingerprint(BaseModel):
     """Unified browser fingerprint for Cloudflare bypass.
-    
-    Can be loaded from browser_daemon artifacts or generated.
+
+    Can be loaded from browser_daemon artifacts or generated. Instances
+    are immutable, so derived values (Chrome version, headers) are
+    computed once and cached.
     """
-    
+
     timestamp: datetime
     user_agent: str = Field(min_length=10)
     platform: Literal["Windows", "macOS", "Linux", "Win32", "MacIntel", "Linux x86_64"]
@@ -40,14 +123,14 @@ class BrowserFingerprint(BaseModel):
     screen: ScreenInfo
     timezone: str = Field(default="America/New_York")
     hardware_concurrency: int = Field(ge=1, le=128)
-    device_memory: Optional[int] = Field(default=None, ge=1, le=32)
+    device_memory: int | None = Field(default=None, ge=1, le=32)
     canvas_hash: str = Field(min_length=16, max_length=32)
-    webgl: Optional[WebGLInfo] = None
+    webgl: WebGLInfo | None = None
     cookies_count: int = Field(default=0, ge=0)
-    
+
     # Metadata
     source: Literal["daemon", "manual", "generated"] = "generated"
-    
+
     @field_validator('timestamp')
     @classmethod
     def validate_freshness(cls, v: datetime) -> datetime:
@@ -60,14 +143,14 @@ class BrowserFingerprint(BaseModel):
                 UserWarning
             )
         return v
-    
-    @property
+
+    @cached_property
     def chrome_version(self) -> int:
         """Extract Chrome version from user agent."""
-        match = re.search(r'Chrome/(\d+)', self.user_agent)
+        match = _CHROME_RE.search(self.user_agent)
         return int(match.group(1)) if match else 120
-    
-    @property
+
+    @cached_property
     def impersonate_profile(self) -> str:
         """Select curl_cffi impersonate profile based on Chrome version."""
         v = self.chrome_version
@@ -78,27 +161,19 @@ class BrowserFingerprint(BaseModel):
         if v >= 110:
             return "chrome110"
         return "chrome101"
-    
-    @property
+
+    @cached_property
     def platform_name(self) -> str:
         """Get platform display name for Sec-CH-UA-Platform header."""
-        mapping = {
-            "Win32": "Windows",
-            "Windows": "Windows",
-            "MacIntel": "macOS",
-            "macOS": "macOS",
-            "Linux x86_64": "Linux",
-            "Linux": "Linux",
-        }
-        return mapping.get(self.platform, "Unknown")
-    
+        return _PLATFORM_NAMES.get(self.platform, "Unknown")
+
     def generate_sec_ch_ua(self) -> str:
         """Generate Sec-CH-UA header."""
         v = self.chrome_version
         return f'"Not;A=Brand";v="24", "Chromium";v="{v}"'
-    
-    def to_headers(self) -> dict[str, str]:
-        """Generate HTTP headers from fingerprint."""
+
+    @cached_property
+    def _headers(self) -> dict[str, str]:
         return {
             'User-Agent': self.user_agent,
             'Accept-Language': f"{self.language},en;q=0.9",
@@ -106,17 +181,43 @@ class BrowserFingerprint(BaseModel):
             'Sec-Ch-Ua-Mobile': '?0',
             'Sec-Ch-Ua-Platform': f'"{self.platform_name}"',
         }
-    
+
+    def to_headers(self) -> dict[str, str]:
+        """Generate HTTP headers from fingerprint."""
+        return dict(self._headers)
+
+    def model_copy(
+        self, *, update: Mapping[str, Any] | None = None, deep: bool = False
+    ) -> BrowserFingerprint:
+        """Copy the fingerprint, dropping cached values the update may change.
+
+        Pydantic copies the instance __dict__, where cached_property keeps
+        its results, so without this a copy with a new user agent would
+        still report the old Chrome version, profile and headers.
+        """
+        copied = super().model_copy(update=update, deep=deep)
+        if update:
+            for name in _CACHED_PROPERTIES:
+                copied.__dict__.pop(name, None)
+        return copied
+
     @classmethod
-    def from_daemon_artifact(cls, path: str | Path) -> BrowserFingerprint:
+    def from_daemon_artifact(
+        cls, path: str | Path, validate: bool = False
+    ) -> BrowserFingerprint:
         """Load fingerprint from browser_daemon.py output.
-        
+
+        The artifact is written by our own daemon, so by default fields are
+        taken as-is (model_construct) rather than run through validation on
+        every session start. Only the staleness check is kept.
+
         Args:
             path: Path to browser-fingerprint.json
-            
+            validate: Validate every field like the regular constructor
+
         Returns:
             BrowserFingerprint instance
-            
+
         Raises:
             FileNotFoundError: If artifact file doesn't exist
             ValueError: If artifact format is invalid
@@ -127,79 +228,74 @@ class BrowserFingerprint(BaseModel):
                 f"Fingerprint artifact not found: {path}\n"
                 "Run: python tools/browser_daemon.py start"
             )
-        
+
         try:
-            data = json.loads(path.read_text())
-        except json.JSONDecodeError as e:
+            data: FingerprintArtifact = _loads(path.read_bytes())
+        except ValueError as e:
             raise ValueError(f"Invalid JSON in {path}: {e}")
-        
-        return cls(
-            timestamp=datetime.fromisoformat(data['timestamp']),
+
+        if validate:
+            build, build_screen, build_webgl = cls, ScreenInfo, WebGLInfo
+        else:
+            build = cls.model_construct
+            build_screen = ScreenInfo.model_construct
+            build_webgl = WebGLInfo.model_construct
+
+        timestamp = datetime.fromisoformat(data['timestamp'])
+        if not validate:
+            cls.validate_freshness(timestamp)
+
+        return build(
+            timestamp=timestamp,
             user_agent=data['user_agent'],
             platform=data['platform'],
             language=data['language'],
-            screen=ScreenInfo(**data['screen']),
+            screen=build_screen(**data['screen']),
             timezone=data['timezone'],
             hardware_concurrency=data['hardware_concurrency'],
             device_memory=data.get('device_memory'),
             canvas_hash=data['canvas_hash'],
-            webgl=WebGLInfo(
+            webgl=build_webgl(
                 vendor=data.get('webgl_vendor'),
                 renderer=data.get('webgl_renderer')
             ) if data.get('webgl_vendor') or data.get('webgl_renderer') else None,
             cookies_count=data['cookies_count'],
             source="daemon"
         )
-    
+
     @classmethod
-    def generate_realistic(cls, platform: Optional[str] = None) -> BrowserFingerprint:
+    def generate_realistic(cls, platform: str | None = None) -> BrowserFingerprint:
         """Generate realistic fingerprint for testing.
-        
+
         Args:
             platform: Force specific platform (Windows/macOS/Linux)
-            
+
         Returns:
             Generated BrowserFinprint
         """
-        chrome_v = random.choice([120, 121, 122, 123, 124, 125, 126])
-        
-        platforms_map = {
-            "Windows": ("Win32", "Windows NT 10.0; Win64; x64"),
-            "macOS": ("MacIntel", "Macintosh; Intel Mac OS X 10_15_7"),
-            "Linux": ("Linux x86_64", "X11; Linux x86_64"),
-        }
-        
-        if platform and platform in platforms_map:
+        rng = _rng()
+        chrome_v = rng.choice(_CHROME_VERSIONS)
+
+        if platform and platform in _PLATFORMS:
             os_name = platform
         else:
-            os_name = random.choice(list(platforms_map.keys()))
-        
-        platform_internal, ua_os = platforms_map[os_name]
-        
+            os_name = rng.choice(_OS_NAMES)
+
+        platform_internal, ua_os = _PLATFORMS[os_name]
+
         user_agent = (
             f"Mozilla/5.0 ({ua_os}) AppleWebKit/537.36 "
             f"(KHTML, like Gecko) Chrome/{chrome_v}.0.0.0 Safari/537.36"
         )
-        
-        # Realistic screen resolutions
-        resolutions = [
-            (1920, 1080), (2560, 1440), (3840, 2160),
-            (1366, 768), (1440, 900), (2880, 1800)
-        ]
-        width, height = random.choice(resolutions)
-        
-        # Generate semi-consistent canvas hash
-        canvas_seed = f"{user_agent}{width}{height}{random.random()}"
-        canvas_hash = hashlib.md5(canvas_seed.encode()).hexdigest()[:16]
-        
-        # WebGL renderers
-        webgl_configs = [
-            ("Google Inc. (NVIDIA)", "ANGLE (NVIDIA, NVIDIA GeForce RTX 3080)"),
-            ("Google Inc. (Intel)", "ANGLE (Intel, Intel(R) UHD Graphics 630)"),
-            ("Google Inc. (AMD)", "ANGLE (AMD, AMD Radeon RX 6800 XT)"),
-        ]
-        webgl_vendor, webgl_renderer = random.choice(webgl_configs)
-        
+
+        width, height = rng.choice(_RESOLUTIONS)
+
+        # The seed always included random.random(), so the canvas hash was
+        # random anyway; take the 16 hex chars straight from urandom
+        canvas_hash = secrets.token_hex(8)
+
+        webgl_vendor, webgl_renderer = rng.choice(_WEBGL_CONFIGS)
+
         return cls(
             timestamp=datetime.now(),
             user_agent=user_agent,
@@ -211,8 +307,8 @@ class BrowserFingerprint(BaseModel):
                 colorDepth=24
             ),
             timezone="America/New_York",
-            hardware_concurrency=random.choice([8, 12, 16]),
-            device_memory=random.choice([8, 16, 32]),
+            hardware_concurrency=rng.choice(_HARDWARE_CONCURRENCY),
+            device_memory=rng.choice(_DEVICE_MEMORY),
             canvas_hash=canvas_hash,
             webgl=WebGLInfo(
                 vendor=webgl_vendor,
@@ -221,8 +317,9 @@ class BrowserFingerprint(BaseModel):
             cookies_count=0,
             source="generated"
         )
-    
+
     model_config = {
+        'frozen': True,
         'json_schema_extra': {
             'examples': [
                 {
@@ -5,7 +5,7 @@ Stealth header generation for iOS Safari emulation
 from __future__ import annotations
 
 import secrets
-from typing import Dict
+from pathlib import Path
 from uuid import uuid4
 
 
@@ -21,23 +21,76 @@ class HeaderGenerator:
     CLIENT_NAME = "Perplexity-iOS"
     CLIENT_ENV = "production"
 
-    def __init__(self, device_id: str | None = None, language: str = "ru-RU"):
+    # Generated device ID is kept here so every run looks like the same device
+    DEVICE_ID_PATH = Path("~/.cache/perplexity_ai/device_id")
+
+    _device_id: str | None = None
+
+    def __init__(
+        self,
+        device_id: str | None = None,
+        language: str = "ru-RU",
+        persist_device_id: bool = True,
+        sentry: bool = True,
+    ):
         """Initialize header generator
 
         Args:
             device_id: Device ID (will generate if None)
             language: Accept-Language value
+            persist_device_id: Reuse the generated device ID across clients
+                and runs (stored in DEVICE_ID_PATH)
+            sentry: Send Sentry tracing headers like the iOS app does.
+                Turning it off skips building them on every request.
         """
-        self.device_id = device_id or f"ios:{uuid4()}"
+        if device_id is None:
+            device_id = self.persistent_device_id() if persist_device_id else f"ios:{uuid4()}"
+        self.device_id = device_id
         self.language = language
+        self.sentry = sentry
+        self._build_headers()
 
-    def base_headers(self) -> Dict[str, str]:
-        """Generate base headers for all requests
+    @classmethod
+    def persistent_device_id(cls) -> str:
+        """Get device ID shared by all clients of this machine
+
+        Read from DEVICE_ID_PATH, or generated and written there on first
+        use. If the file can not be written the ID still lives for the
+        rest of the process.
 
         Returns:
-            Dictionary of base headers
+            Device ID in iOS format
         """
-        return {
+        if HeaderGenerator._device_id is None:
+            try:
+                path: Path | None = cls.DEVICE_ID_PATH.expanduser()
+            except RuntimeError:
+                # No home directory to keep it in
+                path = None
+
+            device_id = ""
+            if path is not None and path.is_file():
+                try:
+                    device_id = path.read_text().strip()
+                except OSError:
+                    pass
+
+            if not device_id.startswith("ios:"):
+                device_id = f"ios:{uuid4()}"
+                if path is not None:
+                    try:
+                        path.parent.mkdir(parents=True, exist_ok=True)
+                        path.write_text(device_id)
+                    except OSError:
+                        pass
+
+            HeaderGenerator._device_id = device_id
+
+        return HeaderGenerator._device_id
+
+    def _build_headers(self) -> None:
+        """Precompute the static header dicts; nothing in them varies per call"""
+        self._base = {
             "User-Agent": self.USER_AGENT,
             "Accept": "*/*",
             "Accept-Language": self.language,
@@ -46,15 +99,8 @@ class HeaderGenerator:
             "Pragma": "no-cache",
             "Cache-Control": "no-cache",
         }
-
-    def api_headers(self) -> Dict[str, str]:
-        """Generate headers for API requests
-
-        Returns:
-            Dictionary of API headers
-        """
-        headers = self.base_headers()
-        headers.update({
+        self._api = {
+            **self._base,
             "X-Client-Name": self.CLIENT_NAME,
             "X-App-ApiClient": "ios",
             "X-Device-ID": self.device_id,
@@ -62,45 +108,62 @@ class HeaderGenerator:
             "X-Client-Env": self.CLIENT_ENV,
             "X-App-ApiVersion": self.API_VERSION,
             "Content-Type": "application/json",
-        })
-        return headers
+        }
+        self._sse = {**self._api, "Accept": "text/event-stream"}
+        self._baggage_prefix = (
+            f"sentry-environment={self.CLIENT_ENV},"
+            "sentry-public_key=f77046e48c26a58c0318fb447f540d47,"
+            f"sentry-release=ai.perplexity.app%40{self.APP_VERSION}%2B16709,"
+            "sentry-trace_id="
+        )
+
+    def base_headers(self) -> dict[str, str]:
+        """Generate base headers for all requests
 
-    def sse_headers(self) -> Dict[str, str]:
+        Returns:
+            Dictionary of base headers
+        """
+        return self._base.copy()
+
+    def api_headers(self) -> dict[str, str]:
+        """Generate headers for API requests
+
+        Returns:
+            Dictionary of API headers
+        """
+        return self._api.copy()
+
+    def sse_headers(self) -> dict[str, str]:
         """Generate headers for SSE requests
 
         Returns:
             Dictionary of SSE-specific headers
         """
-        headers = self.api_headers()
-        headers["Accept"] = "text/event-stream"
-        return headers
+        return self._sse.copy()
 
-    def sentry_headers(self) -> Dict[str, str]:
+    def sentry_headers(self) -> dict[str, str]:
         """Generate Sentry tracing headers
 
         Returns:
             Dictionary of Sentry headers
         """
-        trace_id = uuid4().hex
-        span_id = secrets.token_hex(8)
+        # One urandom read for both ids: 32 hex chars of trace id, 16 of span id
+        ids = secrets.token_hex(24)
+        trace_id = ids[:32]
         return {
-            "sentry-trace": f"{trace_id}-{span_id}-0",
-            "baggage": (
-                f"sentry-environment={self.CLIENT_ENV},"
-                "sentry-public_key=f77046e48c26a58c0318fb447f540d47,"
-                f"sentry-release=ai.perplexity.app%40{self.APP_VERSION}%2B16709,"
-                f"sentry-trace_id={trace_id}"
-            ),
+            "sentry-trace": f"{trace_id}-{ids[32:]}-0",
+            "baggage": self._baggage_prefix + trace_id,
         }
 
     def request_headers(
-        self, sse: bool = False, with_sentry: bool = True
-    ) -> Dict[str, str]:
+        self, sse: bool = False, with_sentry: bool | None = None
+    ) -> dict[str, str]:
         """Generate complete request headers
 
         Args:
             sse: Whether this is an SSE request
-            with_sentry: Whether to include Sentry headers
+            with_sentry: Whether to include Sentry headers (defaults to
+                the generator's sentry setting)
 
         Returns:
             Complete headers dictionary
@@ -110,7 +173,7 @@ class HeaderGenerator:
         else:
             headers = self.api_headers()
 
-        if with_sentry:
+        if self.sentry if with_sentry is None else with_sentry:
             headers.update(self.sentry_headers())
 
         return headers
@@ -3,6 +3,6 @@ Utility modules
 """
 
 from perplexity_ai.utils.sse_parser import SSEParser
-from perplexity_ai.utils.uuid_gen import generate_uuid
+from perplexity_ai.utils.uuid_gen import generate_uuid, generate_uuid_fast
 
-__all__ = ["SSEParser", "generate_uuid"]
+__all__ = ["SSEParser", "generate_uuid", "generate_uuid_fast"]
@@ -0,0 +1,19 @@
+"""
+JSON helpers backed by orjson when installed (pip install perplexity-ai-v2[speedups])
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    from orjson import dumps, loads
+except ImportError:
+    from json import loads
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize to compact UTF-8 JSON bytes, like orjson.dumps"""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+__all__ = ["dumps", "loads"]
@@ -4,8 +4,23 @@ Server-Sent Events (SSE) stream parser
 
 from __future__ import annotations
 
-import json
-from typing import Dict, Iterator, Optional
+import re
+from collections.abc import Iterator
+
+from perplexity_ai.utils import _json
+
+# Payload of every data: line. Trailing blanks are left on: they are JSON
+# whitespace, and a greedy match is far cheaper than a lazy one.
+_DATA_RE = re.compile(rb"^[ \t]*data:[ \t]*([^\n]*)", re.MULTILINE)
+# Same, plus the first character of the next line if that line is not blank
+# (i.e. the event goes on after this data line)
+_DATA_NEXT_RE = re.compile(
+    rb"^[ \t]*data:[ \t]*([^\n]*)(?:\n[ \t\r]*([^ \t\r\n]))?", re.MULTILINE
+)
+# Blank line(s) between events
+_EVENT_SPLIT_RE = re.compile(rb"\n(?:[ \t\r]*\n)+")
+# Blank line terminating an event
+_EVENT_END_RE = re.compile(rb"\r?\n\r?\n")
 
 
 class SSEParser:
@@ -20,56 +35,106 @@ class SSEParser:
     """
 
     def __init__(self):
-        self.event: Optional[str] = None
+        self.event: str | None = None
         self.data: str = ""
+        self.buffer = bytearray()
+        # Length of the buffered prefix already searched for terminators
+        self._scanned = 0
 
     @staticmethod
-    def parse_stream(content: bytes | str) -> Iterator[Dict]:
+    def _decode_event(event: bytes) -> dict | None:
+        """Decode the data lines of one raw event, None if there are none"""
+        data_lines = _DATA_RE.findall(event)
+        if not data_lines:
+            return None
+        try:
+            return _json.loads(b"\n".join(data_lines))
+        except ValueError:
+            return None
+
+    @staticmethod
+    def parse_stream(content: bytes | str) -> Iterator[dict]:
         """Parse SSE stream into events
 
+        Works on bytes throughout, with no per-line Python loop. When every
+        event has at most one data line (Perplexity's format) all payloads
+        are pulled from the whole body in one regex pass; otherwise the
+        body is split into events at blank lines and each event's data
+        lines are joined.
+
         Args:
             content: Raw SSE stream content
 
         Yields:
             Parsed event data as dictionary
         """
-        if isinstance(content, bytes):
-            content = content.decode("utf-8")
-
-        lines = content.split("\n")
-        event_type: Optional[str] = None
-        data_lines: list[str] = []
-
-        for line in lines:
-            line = line.strip()
-
-            if not line:
-                # Empty line = end of event
-                if data_lines:
-                    data = "\n".join(data_lines)
-                    try:
-                        yield json.loads(data)
-                    except json.JSONDecodeError:
-                        pass
-                    data_lines = []
-                    event_type = None
-                continue
-
-            if line.startswith("event:"):
-                event_type = line[6:].strip()
-            elif line.startswith("data:"):
-                data_lines.append(line[5:].strip())
-
-        # Handle remaining data
-        if data_lines:
-            data = "\n".join(data_lines)
-            try:
-                yield json.loads(data)
-            except json.JSONDecodeError:
-                pass
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        if b"\r" in content:
+            content = content.replace(b"\r\n", b"\n")
+
+        matches = _DATA_NEXT_RE.findall(content)
+        if not any(next_line for _, next_line in matches):
+            # Every data line ends its event: decode payloads directly
+            for payload, _ in matches:
+                try:
+                    yield _json.loads(payload)
+                except ValueError:
+                    pass
+            return
+
+        for event in _EVENT_SPLIT_RE.split(content):
+            data = SSEParser._decode_event(event)
+            if data is not None:
+                yield data
+
+    def feed(self, chunk: bytes | str) -> Iterator[dict]:
+        """Feed a chunk of a live stream and yield the events it completes
+
+        Partial events are buffered until their terminating blank line
+        arrives; call flush() at end of stream for an unterminated one.
+
+        Args:
+            chunk: Raw SSE chunk
+
+        Yields:
+            Parsed event data as dictionary
+        """
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+
+        buf = self.buffer
+        # A terminator can straddle the searched prefix by up to 3 bytes;
+        # that prefix is all of the leftover unless a caller stopped early
+        scan_from = max(self._scanned - 3, 0)
+        buf.extend(chunk)
+        pos = 0
+
+        try:
+            while match := _EVENT_END_RE.search(buf, max(pos, scan_from)):
+                event = bytes(buf[pos:match.start()])
+                pos = match.end()
+                data = self._decode_event(event)
+                if data is not None:
+                    yield data
+            scan_from = len(buf)
+        finally:
+            del buf[:pos]
+            self._scanned = max(scan_from - pos, 0)
+
+    def flush(self) -> dict | None:
+        """Decode the buffered event left at end of stream, if any
+
+        Returns:
+            Parsed data of the trailing event, None if there is none
+        """
+        event = bytes(self.buffer)
+        self.buffer.clear()
+        self._scanned = 0
+        return self._decode_event(event)
 
     @staticmethod
-    def parse_line(line: str) -> Optional[Dict]:
+    def parse_line(line: str) -> dict | None:
         """Parse single SSE line
 
         Args:
@@ -85,8 +150,8 @@ class SSEParser:
         if line.startswith("data:"):
             data = line[5:].strip()
             try:
-                return json.loads(data)
-            except json.JSONDecodeError:
+                return _json.loads(data)
+            except ValueError:
                 return None
 
         return None
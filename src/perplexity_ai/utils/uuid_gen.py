@@ -2,6 +2,7 @@
 UUID generation utilities
 """
 
+import secrets
 from uuid import uuid4
 
 
@@ -14,6 +15,18 @@ def generate_uuid() -> str:
     return str(uuid4())
 
 
+def generate_uuid_fast() -> str:
+    """Generate random 128-bit hex ID
+
+    Cheaper than generate_uuid for IDs that only need to be unique
+    (trace ids and the like), not valid UUIDs.
+
+    Returns:
+        32 character hex string
+    """
+    return secrets.token_hex(16)
+
+
 def generate_device_id() -> str:
     """Generate iOS device ID
 
@@ -0,0 +1,77 @@
+"""Tests for the Client.ask answer cache"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from perplexity_ai import Client
+from perplexity_ai.models.request import Mode, Model, Source
+from perplexity_ai.models.response import AskResponse
+
+
+@pytest.fixture
+def calls() -> list[dict[str, Any]]:
+    """Arguments of every ask that reached the endpoint"""
+    return []
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch, calls: list[dict[str, Any]]) -> Iterator[Client]:
+    """Client with the cache on and a fake ask endpoint"""
+    client = Client(device_id="ios:test", cache_size=8)
+
+    def fake_ask(**kwargs: Any) -> AskResponse:
+        calls.append(kwargs)
+        return AskResponse(text="answer", sources=[{"url": "https://example.com"}])
+
+    monkeypatch.setattr(client._ask_endpoint, "ask", fake_ask)
+    yield client
+    client.close()
+
+
+def test_changing_a_response_does_not_change_the_cache(
+    client: Client, calls: list[dict[str, Any]]
+) -> None:
+    first = client.ask("q")
+    first.text = "changed"
+    first.sources.append({"url": "https://changed.example"})
+
+    second = client.ask("q")
+    second.sources.clear()
+
+    third = client.ask("q")
+    assert len(calls) == 1
+    assert third.text == "answer"
+    assert third.sources == [{"url": "https://example.com"}]
+    assert third is not second
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"sources": []},
+        {"sources": ["web"]},
+        {"sources": [Source.WEB]},
+        {"model": "pplx_pro"},
+        {"model": Model.PPLX_PRO},
+        {"mode": Mode.CONCISE},
+    ],
+)
+def test_default_values_share_a_key(
+    client: Client, calls: list[dict[str, Any]], kwargs: dict[str, Any]
+) -> None:
+    client.ask("q")
+    client.ask("q", **kwargs)
+    assert len(calls) == 1
+    assert len(client._cache) == 1
+
+
+def test_different_sources_do_not_share_a_key(
+    client: Client, calls: list[dict[str, Any]]
+) -> None:
+    client.ask("q")
+    client.ask("q", sources=["scholar"])
+    assert len(calls) == 2
@@ -6,6 +6,7 @@ Setup: playwright install chromium
 """
 
 import asyncio
+import binascii
 import hashlib
 import json
 import signal
@@ -13,7 +14,6 @@ import sys
 from dataclasses import asdict, dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
 
 try:
     from playwright.async_api import async_playwright
@@ -33,16 +33,16 @@ class BrowserFingerprint:
     screen: dict
     timezone: str
     hardware_concurrency: int
-    device_memory: Optional[int]
+    device_memory: int | None
     canvas_hash: str
-    webgl_vendor: Optional[str]
-    webgl_renderer: Optional[str]
+    webgl_vendor: str | None
+    webgl_renderer: str | None
     cookies_count: int
 
 
 class BrowserDaemon:
     """Persistent browser daemon."""
-    
+
     def __init__(self):
         self.browser = None
         self.context = None
@@ -50,7 +50,13 @@ class BrowserDaemon:
         self.pidfile = Path('artifacts/browser-daemon.pid')
         self.fp_file = Path('artifacts/browser-fingerprint.json')
         self.running = False
-    
+        self._stop_event = asyncio.Event()
+
+    def request_stop(self):
+        """Ask a running start() to shut down (safe from signal handlers)."""
+        self.running = False
+        self._stop_event.set()
+
     async def extract_fingerprint(self) -> BrowserFingerprint:
         """Extract fingerprint from page."""
         js_fp = await self.page.evaluate("""
@@ -65,7 +71,7 @@ class BrowserDaemon:
             ctx.fillRect(125, 1, 62, 20);
             ctx.fillStyle = '#069';
             ctx.fillText('Browser FP', 2, 15);
-            
+
             let webgl = null;
             try {
                 const gl = document.createElement('canvas').getContext('webgl');
@@ -76,7 +82,7 @@ class BrowserDaemon:
                     };
                 }
             } catch(e) {}
-            
+
             return {
                 userAgent: navigator.userAgent,
                 platform: navigator.platform,
@@ -94,10 +100,15 @@ class BrowserDaemon:
             };
         }
         """)
-        
-        canvas_hash = hashlib.md5(js_fp['canvasData'].encode()).hexdigest()[:16]
+
+        # Canvas identity marker, not a security hash: hash the PNG bytes,
+        # decoded straight from the data URL string (a2b_base64 takes str,
+        # so there is no intermediate .encode() copy)
+        canvas_data = js_fp['canvasData']
+        canvas_png = binascii.a2b_base64(canvas_data.partition(',')[2] or canvas_data)
+        canvas_hash = hashlib.blake2b(canvas_png, digest_size=8).hexdigest()
         cookies = await self.context.cookies()
-        
+
         return BrowserFingerprint(
             timestamp=datetime.now().isoformat(),
             user_agent=js_fp['userAgent'],
@@ -112,36 +123,36 @@ class BrowserDaemon:
             webgl_renderer=js_fp.get('webgl', {}).get('renderer'),
             cookies_count=len(cookies)
         )
-    
+
     async def start(self):
         """Start daemon."""
         if self.pidfile.exists():
             print('⚠️  Daemon already running')
             return
-        
+
         self.pidfile.parent.mkdir(parents=True, exist_ok=True)
-        
+
         print('🚀 Starting browser daemon...')
-        
+
         playwright = await async_playwright().start()
         self.browser = await playwright.chromium.launch(
             headless=False,
             args=['--remote-debugging-port=9222']
         )
-        
+
         self.context = await self.browser.new_context(
             viewport={'width': 1920, 'height': 1080}
         )
-        
+
         self.page = await self.context.new_page()
         await self.page.goto('https://www.perplexity.ai')
-        
+
         # Extract fingerprint
         print('🎭 Extracting fingerprint...')
         fp = await self.extract_fingerprint()
-        
+
         self.fp_file.write_text(json.dumps(asdict(fp), indent=2))
-        
+
         print(f'✅ Saved: {self.fp_file}')
         print(f'   Canvas: {fp.canvas_hash}')
         print(f'   UA: {fp.user_agent[:60]}...')
@@ -151,31 +162,31 @@ class BrowserDaemon:
         print('   python tools/perplexity_curl_client.py "test"')
         print('')
         print('ℹ️  Press Ctrl+C to stop')
-        
+
         import os
         self.pidfile.write_text(str(os.getpid()))
         self.running = True
-        
+
         try:
-            while self.running:
-                await asyncio.sleep(60)
+            # Sleep until request_stop(), no periodic wakeups
+            await self._stop_event.wait()
         except asyncio.CancelledError:
             pass
         finally:
             await self.stop()
-    
+
     async def stop(self):
         """Stop daemon."""
         print('\n💾 Stopping...')
-        
+
         if self.context:
             await self.context.close()
         if self.browser:
             await self.browser.close()
-        
+
         if self.pidfile.exists():
             self.pidfile.unlink()
-        
+
         print('✅ Stopped')
         self.running = False
 
@@ -184,19 +195,24 @@ async def main():
     if len(sys.argv) < 2:
         print('Usage: browser_daemon.py {start|stop|status}')
         sys.exit(1)
-    
+
     daemon = BrowserDaemon()
     command = sys.argv[1].lower()
-    
+
     if command == 'start':
-        def signal_handler(signum, frame):
-            daemon.running = False
-        
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
-        
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, daemon.request_stop)
+            except NotImplementedError:
+                # Windows event loops have no add_signal_handler
+                signal.signal(
+                    signum,
+                    lambda *_: loop.call_soon_threadsafe(daemon.request_stop),
+                )
+
         await daemon.start()
-    
+
     elif command == 'stop':
         if daemon.pidfile.exists():
             import os
@@ -209,21 +225,21 @@ async def main():
                 daemon.pidfile.unlink()
         else:
             print('❌ Daemon not running')
-    
+
     elif command == 'status':
         if daemon.pidfile.exists():
             pid = int(daemon.pidfile.read_text())
             print(f'✅ Daemon running (PID: {pid})')
-            
+
             if daemon.fp_file.exists():
-                fp = json.loads(daemon.fp_file.read_text())
-                print(f'\n🎭 Fingerprint:')
+                fp = json.loads(daemon.fp_file.read_bytes())
+                print('\n🎭 Fingerprint:')
                 print(f'   Canvas: {fp["canvas_hash"]}')
                 print(f'   Cookies: {fp["cookies_count"]}')
                 print(f'   Updated: {fp["timestamp"]}')
         else:
             print('❌ Daemon not running')
-    
+
     else:
         print(f'❌ Unknown: {command}')
         sys.exit(1)
@@ -5,24 +5,130 @@ Direct implementation using curl_cffi for production use.
 Can be used independently or as validation for library implementation.
 """
 
+import asyncio
 import json
+import os
+import re
 import sys
-import uuid
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
+# orjson (the library's 'speedups' extra) parses bytes directly and is
+# several times faster on the SSE stream; stdlib json is the fallback
+try:
+    from orjson import dumps as _dumps
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode()
+
 # Try library import first
 try:
-    from perplexity_ai.session import PerplexitySession
     from perplexity_ai.parsers.sse import SSEParser
+    from perplexity_ai.session import AsyncPerplexitySession, PerplexitySession
     USE_LIBRARY = True
 except ImportError:
     USE_LIBRARY = False
     from curl_cffi import requests
 
+_CHROME_RE = re.compile(r'Chrome/(\d+)')
+
+# model_preference per mode, 'turbo' for any other
+_MODEL_PREFERENCES = {'copilot': 'pplx-pro'}
+
+_PLATFORM_NAMES = {
+    'Win32': 'Windows',
+    'Windows': 'Windows',
+    'MacIntel': 'macOS',
+    'Linux x86_64': 'Linux',
+}
+
+# Present in every SSE frame that carries a FINAL step, whatever the spacing
+_FINAL_MARKER = b'"FINAL"'
+
+# Fallback curl sessions by (impersonate, headers, cookies); clients with the
+# same fingerprint and cookies reuse one and its warm connections
+_SESSIONS: dict = {}
+
+
+def _uuid4() -> str:
+    """Random UUID v4 string, like str(uuid.uuid4()) at about half the cost."""
+    b = bytearray(os.urandom(16))
+    b[6] = b[6] & 0x0f | 0x40  # version 4
+    b[8] = b[8] & 0x3f | 0x80  # RFC 4122 variant
+    h = b.hex()
+    return f'{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}'
+
+
+# Static part of the perplexity_ask request body, encoded once per client.
+# language/timezone are filled in per client, the fields built by
+# _build_payload are appended per request.
+_PAYLOAD_TEMPLATE = {
+    'version': '2.18',
+    'source': 'default',
+    'language': None,
+    'timezone': None,
+    'attachments': [],
+    'sources': ['web'],
+    'search_recency_filter': None,
+    'search_focus': 'internet',
+    'is_related_query': False,
+    'is_sponsored': False,
+    'prompt_source': 'user',
+    'query_source': 'user',
+    'is_incognito': False,
+    'local_search_enabled': False,
+    'use_schematized_api': True,
+    'send_back_text_in_streaming_api': False,
+    'supported_block_use_cases': [
+        'answer_modes', 'media_items', 'knowledge_cards',
+        'inline_entity_cards', 'place_widgets'
+    ],
+    'client_coordinates': {
+        'location_lat': 40.7128,
+        'location_lng': -74.006
+    },
+    'mentions': [],
+    'skip_search_enabled': True,
+    'is_nav_suggestions_disabled': False,
+    'always_search_override': False,
+    'override_no_search': False,
+    'should_ask_for_mcptool_confirmation': True,
+    'browser_agent_allow_once_from_toggle': False,
+    'force_enable_browser_agent': False,
+    'supported_features': ['browser_agent_permission_banner.v1.1']
+}
+
 
 class PerplexityCurlClient:
     """Standalone curl_cffi client."""
-    
+
+    __slots__ = (
+        'session', 'parser', 'fp_file', 'cookies_file', 'fp', 'cookies', '_payload_prefix',
+    )
+
+    ASK_URL = 'https://www.perplexity.ai/rest/sse/perplexity_ask'
+
+    # Fallback session headers. None values come from the fingerprint; they
+    # are placeholders so the header order stays the same.
+    _HEADERS_TEMPLATE = {
+        'User-Agent': None,
+        'Accept': 'text/event-stream',
+        'Accept-Language': None,
+        'Accept-Encoding': 'gzip, deflate, br',
+        'Content-Type': 'application/json',
+        'Sec-Ch-Ua': None,
+        'Sec-Ch-Ua-Mobile': '?0',
+        'Sec-Ch-Ua-Platform': None,
+        'Sec-Fetch-Dest': 'empty',
+        'Sec-Fetch-Mode': 'cors',
+        'Sec-Fetch-Site': 'same-origin',
+        'Origin': 'https://www.perplexity.ai',
+        'Referer': 'https://www.perplexity.ai/',
+    }
+
     def __init__(
         self,
         fingerprint_file: str = 'artifacts/browser-fingerprint.json',
@@ -31,174 +137,260 @@ class PerplexityCurlClient:
         if USE_LIBRARY:
             # Use library implementation
             self.session = PerplexitySession()
-            self.parser = SSEParser()
+            # Only used for complete bodies; streamed responses get their own
+            self.parser = SSEParser(keep_events=False)
+            language, timezone = 'en-US', 'America/New_York'
         else:
             # Fallback standalone
             self.fp_file = Path(fingerprint_file)
             self.cookies_file = Path(cookies_file)
-            
+
             self.fp = self._load_fingerprint()
             self.cookies = self._load_cookies()
             self.session = self._create_session()
-    
+            language = self.fp.get('language', 'en-US')
+            timezone = self.fp.get('timezone', 'America/New_York')
+
+        payload_base = {**_PAYLOAD_TEMPLATE, 'language': language, 'timezone': timezone}
+        # Encoded static fields without the closing brace, ready for the
+        # per-request fields to be spliced on
+        self._payload_prefix = _dumps(payload_base)[:-1] + b','
+
     def _load_fingerprint(self) -> dict:
         if not self.fp_file.exists():
             raise FileNotFoundError(f'Fingerprint not found: {self.fp_file}')
-        return json.loads(self.fp_file.read_text())
-    
+        return _loads(self.fp_file.read_bytes())
+
     def _load_cookies(self) -> dict:
         if not self.cookies_file.exists():
             return {}
-        
-        cookies_data = json.loads(self.cookies_file.read_text())
-        cookies = {}
-        for cookie in cookies_data:
-            if 'perplexity.ai' in cookie.get('domain', ''):
-                cookies[cookie['name']] = cookie['value']
-        
-        return cookies
-    
+
+        cookies_data = _loads(self.cookies_file.read_bytes())
+        return {
+            cookie['name']: cookie['value']
+            for cookie in cookies_data
+            if 'perplexity.ai' in cookie.get('domain', '')
+        }
+
     def _create_session(self):
-        import re
         ua = self.fp['user_agent']
-        chrome_match = re.search(r'Chrome/(\d+)', ua)
+        chrome_match = _CHROME_RE.search(ua)
         chrome_version = int(chrome_match.group(1)) if chrome_match else 120
-        
+
         if chrome_version >= 120:
             impersonate = "chrome120"
         elif chrome_version >= 110:
             impersonate = "chrome110"
         else:
             impersonate = "chrome101"
-        
-        platform_map = {
-            'Win32': 'Windows',
-            'Windows': 'Windows',
-            'MacIntel': 'macOS',
-            'Linux x86_64': 'Linux',
-        }
-        platform_name = platform_map.get(self.fp['platform'], 'Unknown')
-        
-        headers = {
-            'User-Agent': ua,
-            'Accept': 'text/event-stream',
-            'Accept-Language': f"{self.fp['language']},en;q=0.9",
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Content-Type': 'application/json',
-            'Sec-Ch-Ua': f'"Not;A=Brand";v="24", "Chromium";v="{chrome_version}"',
-            'Sec-Ch-Ua-Mobile': '?0',
-            'Sec-Ch-Ua-Platform': f'"{platform_name}"',
-            'Sec-Fetch-Dest': 'empty',
-            'Sec-Fetch-Mode': 'cors',
-            'Sec-Fetch-Site': 'same-origin',
-            'Origin': 'https://www.perplexity.ai',
-            'Referer': 'https://www.perplexity.ai/',
-        }
-        
-        return requests.Session(
-            headers=headers,
-            cookies=self.cookies,
-            impersonate=impersonate
-        )
-    
+
+        platform_name = _PLATFORM_NAMES.get(self.fp['platform'], 'Unknown')
+
+        headers = self._HEADERS_TEMPLATE.copy()
+        headers['User-Agent'] = ua
+        headers['Accept-Language'] = f"{self.fp['language']},en;q=0.9"
+        headers['Sec-Ch-Ua'] = f'"Not;A=Brand";v="24", "Chromium";v="{chrome_version}"'
+        headers['Sec-Ch-Ua-Platform'] = f'"{platform_name}"'
+
+        key = (impersonate, frozenset(headers.items()), frozenset(self.cookies.items()))
+        session = _SESSIONS.get(key)
+        if session is None:
+            session = _SESSIONS[key] = requests.Session(
+                headers=headers,
+                cookies=self.cookies,
+                impersonate=impersonate
+            )
+        return session
+
     def _build_payload(self, query: str, mode: str = 'concise') -> dict:
+        """Per-request fields of the body; the rest is in _payload_prefix."""
         return {
             'query_str': query,
-            'version': '2.18',
-            'source': 'default',
-            'language': self.fp.get('language', 'en-US') if not USE_LIBRARY else 'en-US',
-            'timezone': self.fp.get('timezone', 'America/New_York') if not USE_LIBRARY else 'America/New_York',
             'mode': mode,
-            'attachments': [],
-            'sources': ['web'],
-            'search_recency_filter': None,
-            'search_focus': 'internet',
-            'frontend_uuid': str(uuid.uuid4()),
-            'frontend_context_uuid': str(uuid.uuid4()),
-            'model_preference': 'pplx-pro' if mode == 'copilot' else 'turbo',
-            'is_related_query': False,
-            'is_sponsored': False,
-            'prompt_source': 'user',
-            'query_source': 'user',
-            'is_incognito': False,
-            'local_search_enabled': False,
-            'use_schematized_api': True,
-            'send_back_text_in_streaming_api': False,
-            'supported_block_use_cases': [
-                'answer_modes', 'media_items', 'knowledge_cards',
-                'inline_entity_cards', 'place_widgets'
-            ],
-            'client_coordinates': {
-                'location_lat': 40.7128,
-                'location_lng': -74.006
-            },
-            'mentions': [],
-            'skip_search_enabled': True,
-            'is_nav_suggestions_disabled': False,
-            'always_search_override': False,
-            'override_no_search': False,
-            'should_ask_for_mcptool_confirmation': True,
-            'browser_agent_allow_once_from_toggle': False,
-            'force_enable_browser_agent': False,
-            'supported_features': ['browser_agent_permission_banner.v1.1']
+            'frontend_uuid': _uuid4(),
+            'frontend_context_uuid': _uuid4(),
+            'model_preference': _MODEL_PREFERENCES.get(mode, 'turbo'),
         }
-    
-    def _parse_response_fallback(self, text: str) -> dict:
-        """Fallback parser if library not available."""
-        steps = []
-        
-        for line in text.split('\n'):
-            if not line.startswith('data: '):
+
+    def _build_body(self, query: str, mode: str = 'concise') -> bytes:
+        """Encode request body, only the per-request fields are serialized."""
+        return self._payload_prefix + _dumps(self._build_payload(query, mode))[1:]
+
+    @staticmethod
+    def _iter_steps(lines: Iterable[bytes]) -> Iterator[dict]:
+        """Decode the steps of SSE data: lines that may hold the answer.
+
+        Only a FINAL step carries the answer, so frames without the FINAL
+        marker are skipped by a substring check instead of being decoded.
+        """
+        for line in lines:
+            if not line.startswith(b'data: ') or _FINAL_MARKER not in line:
                 continue
-            
+
             try:
-                data = json.loads(line[6:])
-                if isinstance(data, list):
-                    steps.extend(data)
-                elif isinstance(data, dict):
-                    steps.append(data)
-            except json.JSONDecodeError:
-                pass
-        
+                data = _loads(line[6:])
+            except ValueError:
+                continue
+            # JSON decoders only ever return exact list/dict, so compare types
+            kind = type(data)
+            if kind is list:
+                yield from data
+            elif kind is dict:
+                yield data
+
+    @staticmethod
+    def _answer_from_steps(steps: Iterable[dict]) -> dict:
+        """Extract the answer of the first FINAL step that has one.
+
+        Stops pulling steps as soon as it is found.
+        """
         for step in steps:
             if step.get('step_type') == 'FINAL':
                 content = step.get('content', {})
                 answer_str = content.get('answer', '')
-                
+
                 if answer_str:
                     try:
-                        answer_obj = json.loads(answer_str)
+                        answer_obj = _loads(answer_str)
                         return {
                             'text': answer_obj.get('answer', ''),
                             'web_results': answer_obj.get('web_results', []),
                             'structured_answer': answer_obj.get('structured_answer'),
                         }
-                    except json.JSONDecodeError:
+                    except ValueError:
                         return {'text': answer_str, 'web_results': [], 'structured_answer': None}
-        
+
         return {'text': '', 'web_results': [], 'structured_answer': None}
-    
+
+    def _parse_response_fallback(self, body: bytes) -> dict:
+        """Fallback parser if library not available (complete body)."""
+        return self._answer_from_steps(self._iter_steps(body.split(b'\n')))
+
+    def _parse_response_stream(self, response) -> dict:
+        """Fallback parser if library not available (streamed response).
+
+        Lines are parsed as they arrive and reading stops at the answer,
+        so the body is never held in memory whole.
+        """
+        return self._answer_from_steps(self._iter_steps(response.iter_lines()))
+
     def ask(self, query: str, mode: str = 'concise', raw: bool = False) -> str | dict:
         """Ask question."""
-        payload = self._build_payload(query, mode)
-        
+        body = self._build_body(query, mode)
+
         response = self.session.post(
-            'https://www.perplexity.ai/rest/sse/perplexity_ask',
-            json=payload,
+            self.ASK_URL,
+            data=body,
+            stream=True,
             timeout=120
         )
-        
-        if response.status_code != 200:
-            raise Exception(f'HTTP {response.status_code}: {response.text[:200]}')
-        
+
+        try:
+            if response.status_code != 200:
+                # Only the start of the body goes into the message; stop
+                # reading (and decoding) there
+                head = bytearray()
+                for chunk in response.iter_content():
+                    head += chunk
+                    if len(head) >= 200:
+                        break
+                raise Exception(
+                    f'HTTP {response.status_code}: {head[:200].decode("utf-8", "replace")}'
+                )
+
+            if USE_LIBRARY:
+                # extract_answer() returns at the first FINAL answer, so the
+                # rest of the stream is never read. That leaves unread bytes
+                # in the parser buffer, so every response gets its own parser.
+                parser = SSEParser(keep_events=False)
+                events = (
+                    event
+                    for chunk in response.iter_content()
+                    for event in parser.feed(chunk)
+                )
+                result = parser.extract_answer(events)
+            else:
+                result = self._parse_response_stream(response)
+        finally:
+            response.close()
+
+        return result if raw else result['text']
+
+    def _create_async_session(self):
+        """Async session with the same fingerprint, headers and cookies."""
         if USE_LIBRARY:
-            events = self.parser.parse_complete(response.text)
-            result = self.parser.extract_answer(events)
-        else:
-            result = self._parse_response_fallback(response.text)
-        
+            return AsyncPerplexitySession(
+                fingerprint=self.session.fingerprint,
+                cookies=dict(self.session.cookies),
+            )
+        return requests.AsyncSession(
+            headers=dict(self.session.headers),
+            cookies=dict(self.session.cookies),
+            impersonate=self.session.impersonate,
+        )
+
+    def _parse_body(self, body: bytes) -> dict:
+        """Extract the answer from a complete SSE body."""
+        if USE_LIBRARY:
+            return self.parser.extract_answer(self.parser.parse_complete(body))
+        return self._parse_response_fallback(body)
+
+    async def _ask_async(self, session, query: str, mode: str, raw: bool) -> str | dict:
+        response = await session.post(
+            self.ASK_URL,
+            data=self._build_body(query, mode),
+            timeout=120
+        )
+
+        if response.status_code != 200:
+            head = response.content[:200].decode('utf-8', 'replace')
+            raise Exception(f'HTTP {response.status_code}: {head}')
+
+        result = self._parse_body(response.content)
         return result if raw else result['text']
 
+    async def ask_many(
+        self,
+        queries: list[str],
+        mode: str = 'concise',
+        raw: bool = False,
+        max_concurrency: int = 8,
+    ) -> list:
+        """Ask several questions concurrently over one async session.
+
+        The requests share the session's connection (HTTP/2 streams), so
+        TLS is set up once rather than once per question. At most
+        max_concurrency requests are in flight at a time.
+
+        Returns:
+            One entry per query, in order: its answer, or the exception
+            raised for it
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async with self._create_async_session() as session:
+            async def ask_one(query: str):
+                async with semaphore:
+                    return await self._ask_async(session, query, mode, raw)
+
+            return await asyncio.gather(
+                *(ask_one(query) for query in queries), return_exceptions=True
+            )
+
+
+# CLI switches: flag -> (option, value)
+_FLAGS = {
+    '--pro': ('mode', 'copilot'),
+    '--raw': ('raw', True),
+}
+
+
+def _print_result(result, raw: bool):
+    if raw:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        print(f'📝 {result}')
+
 
 def main():
     if len(sys.argv) < 2:
@@ -208,45 +400,79 @@ def main():
         print('  python tools/perplexity_curl_client.py "Question"')
         print('  python tools/perplexity_curl_client.py --pro "Question"')
         print('  python tools/perplexity_curl_client.py --raw "Question"')
+        print('  python tools/perplexity_curl_client.py --batch questions.txt')
         print('')
         print(f'Library mode: {"ENABLED" if USE_LIBRARY else "DISABLED (fallback)"}')
         sys.exit(1)
-    
+
+    options = {'mode': 'concise', 'raw': False}
+    batch_file = None
+    args = sys.argv[1:]
+
+    # Leading --flags, then the question; unknown flags are ignored
+    while args and args[0].startswith('--'):
+        flag = args.pop(0)
+        if flag == '--batch':
+            if args:
+                batch_file = Path(args.pop(0))
+        elif flag in _FLAGS:
+            key, value = _FLAGS[flag]
+            options[key] = value
+
+    mode = options['mode']
+    raw = options['raw']
+
+    if batch_file is not None:
+        try:
+            queries = [q for q in batch_file.read_text().splitlines() if q.strip()]
+        except OSError as e:
+            print(f'❌ {e}')
+            sys.exit(1)
+    else:
+        queries = [' '.join(args)] if args else []
+
+    if not queries:
+        print('❌ No question provided')
+        sys.exit(1)
+
+    # Build the client only once the arguments are known to be usable: it
+    # reads the artifacts and sets up the curl session
     try:
         client = PerplexityCurlClient()
     except FileNotFoundError as e:
         print(f'❌ {e}')
         print('Run: python tools/browser_daemon.py start')
         sys.exit(1)
-    
-    mode = 'concise'
-    raw = False
-    args_idx = 1
-    
-    while args_idx < len(sys.argv) and sys.argv[args_idx].startswith('--'):
-        if sys.argv[args_idx] == '--pro':
-            mode = 'copilot'
-        elif sys.argv[args_idx] == '--raw':
-            raw = True
-        args_idx += 1
-    
-    query = ' '.join(sys.argv[args_idx:])
-    
-    if not query:
-        print('❌ No question provided')
-        sys.exit(1)
-    
+
+    if batch_file is not None:
+        print(f'🔍 {len(queries)} questions from {batch_file}')
+        print(f'⚙️  Mode: {mode}')
+        print('⏳ Waiting...\n')
+
+        # One async session, all questions in flight together
+        results = asyncio.run(client.ask_many(queries, mode=mode, raw=raw))
+
+        failed = False
+        for query, result in zip(queries, results):
+            print(f'🔍 {query}')
+            if isinstance(result, Exception):
+                print(f'❌ {result}')
+                failed = True
+            else:
+                _print_result(result, raw)
+            print('')
+
+        if failed:
+            sys.exit(1)
+        return
+
+    query = queries[0]
     print(f'🔍 {query}')
     print(f'⚙️  Mode: {mode}')
     print('⏳ Waiting...\n')
-    
+
     try:
-        result = client.ask(query, mode=mode, raw=raw)
-        
-        if raw:
-            print(json.dumps(result, indent=2, ensure_ascii=False))
-        else:
-            print(f'📝 {result}')
+        _print_result(client.ask(query, mode=mode, raw=raw), raw)
     except Exception as e:
         print(f'❌ {e}')
         sys.exit(1)